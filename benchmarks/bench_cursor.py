@@ -0,0 +1,53 @@
+"""Compare iterating a bare pymongo cursor with iterating a WrappedCursor
+
+Requires a MongoDB server listening on localhost.
+
+    $ python benchmarks/bench_cursor.py
+"""
+import timeit
+from pymongo import MongoClient
+from pymongoext import Model, Manipulator
+
+DOCUMENTS = 50000
+REPEAT = 5
+
+
+class BenchCursor(Model):
+    __collection_name__ = 'bench_cursor'
+    __auto_update__ = False
+
+    @classmethod
+    def db(cls):
+        return MongoClient()['the_test_db']
+
+
+class BenchCursorNoManipulators(BenchCursor):
+    """Same collection without the default manipulators, to measure the wrapper itself"""
+    IdWithoutUnderscoreManipulator = Manipulator
+    ParseInputsManipulator = Manipulator
+    MunchManipulator = Manipulator
+
+
+def _report(label, statement):
+    best = min(timeit.repeat(statement, number=1, repeat=REPEAT))
+    print('{:<40} {:>8.4f}s {:>10.0f} docs/s'.format(label, best, DOCUMENTS / best))
+
+
+if __name__ == '__main__':
+    collection = BenchCursor.c()
+    collection.drop()
+    collection.insert_many([{'n': i, 'name': 'doc-{}'.format(i)} for i in range(DOCUMENTS)])
+
+    _report('pymongo cursor', lambda: list(collection.find()))
+    _report('WrappedCursor, no manipulators', lambda: list(BenchCursorNoManipulators.find()))
+    _report('WrappedCursor.to_list, no manipulators', lambda: BenchCursorNoManipulators.find().to_list())
+    _report('WrappedCursor, default manipulators', lambda: list(BenchCursor.find()))
+    _report('WrappedCursor.to_list, default manipulators', lambda: BenchCursor.find().to_list())
+
+    chain_number = 100000
+    chain = timeit.timeit(lambda: collection.find().limit(10).sort('n').skip(5), number=chain_number)
+    wrapped_chain = timeit.timeit(lambda: BenchCursor.find().limit(10).sort('n').skip(5), number=chain_number)
+    print('{:<40} {:>8.2f}us'.format('pymongo find().limit().sort().skip()', chain / chain_number * 1e6))
+    print('{:<40} {:>8.2f}us'.format('wrapped find().limit().sort().skip()', wrapped_chain / chain_number * 1e6))
+
+    collection.drop()
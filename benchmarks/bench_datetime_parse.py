@@ -0,0 +1,48 @@
+"""Compare the per value cost of parsing datetimes with ``dateutil`` and with ``DateTimeField``
+
+No MongoDB server is required.
+
+    $ python benchmarks/bench_datetime_parse.py
+"""
+import timeit
+from datetime import datetime, timedelta
+from dateutil import parser
+from pymongoext import DateTimeField
+from pymongoext.fields import _parse_datetime_string
+
+NUMBER = 20000
+REPEAT = 5
+
+_START = datetime(2020, 3, 1)
+_TIMES = [_START + timedelta(seconds=i) for i in range(NUMBER)]
+"""One distinct time per value, so that the memo of parsed strings is never hit"""
+
+VALUES = [
+    ('ISO 8601', [t.strftime('%Y-%m-%dT%H:%M:%S.123456') for t in _TIMES]),
+    ('ISO 8601 with Z', [t.strftime('%Y-%m-%dT%H:%M:%SZ') for t in _TIMES]),
+    ('declared format', [t.strftime('%d/%m/%Y %H:%M:%S') for t in _TIMES]),
+    ('memoized', ['2020-03-01 10:00:00'] * NUMBER),
+]
+
+FORMATS = ['%d/%m/%Y %H:%M:%S']
+
+
+def _best(parse, values):
+    def run():
+        _parse_datetime_string.cache_clear()
+        for value in values:
+            parse(value)
+
+    return min(timeit.repeat(run, number=1, repeat=REPEAT)) / len(values) * 1e6
+
+
+if __name__ == '__main__':
+    field = DateTimeField(formats=FORMATS)
+    print('{:<20} {:>12} {:>16}'.format('', 'dateutil', 'DateTimeField'))
+    for label, values in VALUES:
+        before = _best(lambda v: parser.parse(v, dayfirst=True), values)
+        after = _best(lambda v: field.parse(v, False), values)
+        print('{:<20} {:>10.2f}us {:>14.2f}us'.format(label, before, after))
+
+    epochs = [1583056800 + i for i in range(NUMBER)]
+    print('{:<20} {:>12} {:>14.2f}us'.format('epoch seconds', '-', _best(lambda v: field.parse(v, False), epochs)))
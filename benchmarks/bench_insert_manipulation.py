@@ -0,0 +1,64 @@
+"""Compare serial and parallel manipulation of documents passed to ``Model.insert_many``
+
+Only the manipulation is measured, no MongoDB server is required.
+
+    $ python benchmarks/bench_insert_manipulation.py
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from pymongoext import Model, DictField, StringField, IntField, FloatField, DateTimeField, ListField
+from pymongoext.binder import _manipulated_chunks
+
+DOCUMENTS = 100000
+CHUNK_SIZE = 1000
+
+
+class Event(Model):
+    @classmethod
+    def db(cls):
+        raise NotImplementedError
+
+    __schema__ = DictField(dict(
+        name=StringField(required=True),
+        count=IntField(default=0),
+        score=FloatField(),
+        tags=ListField(StringField(), default=list),
+        createdAt=DateTimeField(required=True),
+        source=DictField(dict(
+            host=StringField(),
+            port=IntField(default=27017)
+        ))
+    ))
+
+
+def _documents():
+    for i in range(DOCUMENTS):
+        yield {
+            'name': 'event-{}'.format(i),
+            'count': str(i),
+            'score': '{}.5'.format(i),
+            'createdAt': '2019-03-{:02d}T10:00:00'.format(i % 28 + 1),
+            'source': {'host': 'localhost'}
+        }
+
+
+def _run(label, executor=None):
+    start = time.perf_counter()
+    total = sum(len(chunk) for chunk, _ in _manipulated_chunks(Event, _documents(), CHUNK_SIZE, executor))
+    elapsed = time.perf_counter() - start
+    print('{:<24} {:>8} docs {:>8.3f}s {:>10.0f} docs/s'.format(label, total, elapsed, total / elapsed))
+    return elapsed
+
+
+if __name__ == '__main__':
+    workers = os.cpu_count() or 1
+    serial = _run('serial')
+
+    with ThreadPoolExecutor(workers) as executor:
+        _run('threads ({})'.format(workers), executor)
+
+    with ProcessPoolExecutor(workers) as executor:
+        parallel = _run('processes ({})'.format(workers), executor)
+
+    print('process pool speedup: {:.2f}x'.format(serial / parallel))
@@ -0,0 +1,49 @@
+"""Compare one Model.get per id (N+1 queries) with batching the lookups through a Loader
+
+Requires a MongoDB server listening on localhost.
+
+    $ python benchmarks/bench_loader.py
+"""
+import timeit
+from pymongo import MongoClient
+from pymongoext import Model
+
+DOCUMENTS = 10000
+LOOKUPS = 500
+REPEAT = 5
+
+
+class BenchLoader(Model):
+    __collection_name__ = 'bench_loader'
+    __auto_update__ = False
+
+    @classmethod
+    def db(cls):
+        return MongoClient()['the_test_db']
+
+
+def n_plus_one(ids):
+    return [BenchLoader.get(id) for id in ids]
+
+
+def batched(ids):
+    with BenchLoader.loader() as loader:
+        pending = [loader.load(id) for id in ids]
+    return [p.result() for p in pending]
+
+
+def _report(label, statement):
+    best = min(timeit.repeat(statement, number=1, repeat=REPEAT))
+    print('{:<40} {:>8.4f}s {:>10.0f} lookups/s'.format(label, best, LOOKUPS / best))
+
+
+if __name__ == '__main__':
+    collection = BenchLoader.c()
+    collection.drop()
+    ids = collection.insert_many([{'n': i} for i in range(DOCUMENTS)]).inserted_ids[::DOCUMENTS // LOOKUPS]
+
+    assert n_plus_one(ids) == batched(ids)
+    _report('Model.get per id', lambda: n_plus_one(ids))
+    _report('Loader', lambda: batched(ids))
+
+    collection.drop()
@@ -1,5 +1,8 @@
 from .model import Model
+from .aio import AsyncModel
 from .fields import *
 from .manipulators import Manipulator
+from .connection import register_connection, get_client, get_database, disconnect
+from .sync import sync_models
 
 __version__ = '2.3.3'
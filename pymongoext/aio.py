@@ -0,0 +1,344 @@
+import asyncio
+import time
+from pymongo.errors import BulkWriteError
+from pymongoext.binder import _projection, _invalidate, _invalidate_ids, _manipulate_request, _BatchedBulkWrite
+from pymongoext.exceptions import NoDocumentFound, MultipleDocumentsFound
+from pymongoext.loader import AsyncLoader, DEFAULT_MAX_BATCH_SIZE
+from pymongoext.manipulators import IncomingAction
+from pymongoext.model import Model
+
+__all__ = [
+    'AsyncModel',
+    'AsyncWrappedCursor'
+]
+
+
+class AsyncWrappedCursor:
+    def __init__(self, cursor, model, projection=None):
+        """Wraps an asynchronous cursor such as ``motor.motor_asyncio.AsyncIOMotorCursor``
+
+        Documents are passed through the outgoing manipulators of the model as they are retrieved.
+
+        Args:
+            cursor: The underlying asynchronous cursor
+            model (Type[AsyncModel]): The associated model
+            projection (dict|list): The projection of the query, passed on to the outgoing manipulators
+        """
+        self.cursor = cursor
+        self.model = model
+        self.projection = projection
+        self._updated = False
+        self._pipelines = None
+
+    def __getattr__(self, item):
+        def _wrap(method):
+            def _wrapper(*args, **kwargs):
+                res = method(*args, **kwargs)
+                if isinstance(res, cursor_type):
+                    return AsyncWrappedCursor(res, model, projection)
+                return res
+            return _wrapper
+
+        model = self.model
+        projection = self.projection
+        cursor_type = type(self.cursor)
+        attr = getattr(self.cursor, item)
+        return _wrap(attr) if callable(attr) else attr
+
+    def _outgoing(self):
+        """Returns the manipulator pipelines for the projection of this cursor, resolved once"""
+        if self._pipelines is None:
+            self._pipelines = self.model._pipelines(self.projection)
+        return self._pipelines
+
+    async def next(self):
+        """Retrieve the next document
+
+        Raises:
+            StopAsyncIteration: If there are no more documents
+        """
+        if not self._updated:
+            await self.model._ensure_updated()
+            self._updated = True
+        doc = await self.cursor.__anext__()
+        return self._outgoing().apply_outgoing(doc, self.model)
+
+    async def to_list(self, length):
+        """Retrieve up to ``length`` documents as a list. If ``length`` is ``None``, retrieve all documents.
+
+        Args:
+            length (int): Maximum number of documents to retrieve
+
+        Returns:
+            list
+        """
+        if not self._updated:
+            await self.model._ensure_updated()
+            self._updated = True
+        docs = await self.cursor.to_list(length)
+        return self._outgoing().apply_outgoing_batch(docs, self.model)
+
+    def __aiter__(self):
+        return self
+
+    __anext__ = next
+
+
+def _unsupported(name):
+    """Create a class method rejecting a synchronous API of :class:`pymongoext.model.Model`"""
+    def _method(cls, *args, **kwargs):
+        raise NotImplementedError('{} is not supported by AsyncModel'.format(name))
+
+    _method.__name__ = name
+    _method.__doc__ = 'Not supported, raises ``NotImplementedError``'
+    return classmethod(_method)
+
+
+class AsyncModel(Model):
+    """An asyncio variant of :class:`pymongoext.model.Model`
+
+    :meth:`~db` should return an asynchronous database, such as ``motor.motor_asyncio.AsyncIOMotorDatabase``.
+    The wrapped collection methods are coroutines and :meth:`~find` returns an :class:`~AsyncWrappedCursor`.
+    Schema parsing and manipulators are applied exactly as they are on :class:`pymongoext.model.Model`.
+    ``find_raw``, ``find_raw_batches``, ``find_columns``, ``export``, ``export_columns``
+    and chunked ``insert_many`` are not supported and raise ``NotImplementedError``.
+
+    The indexes and validator are synced on the first operation by running :meth:`~_update`
+    in the default executor against the synchronous pymongo database wrapped by the Motor database.
+    Set ``__auto_update__`` to ``False`` if :meth:`~db` does not return a Motor database.
+
+    Examples:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from motor.motor_asyncio import AsyncIOMotorClient
+            from pymongoext import AsyncModel, DictField, StringField
+
+            client = AsyncIOMotorClient()
+
+            class User(AsyncModel):
+                @classmethod
+                def db(cls):
+                    return client['my_database_name']
+
+                __schema__ = DictField(dict(
+                    email=StringField(required=True)
+                ))
+
+            async def main():
+                await User.insert_one({"email": "john.doe@dummy.com"})
+                async for user in User.find():
+                    print(user.email)
+    """
+
+    @classmethod
+    def c(cls):
+        """Get the asynchronous collection associated with this model.
+
+        Unlike :meth:`pymongoext.model.Model.c`, this does not sync the indexes and schema validators.
+        See :meth:`~_ensure_updated`
+        """
+        return cls._collection()
+
+    @classmethod
+    def _pymongo_db(cls):
+        """Returns the pymongo database wrapped by the Motor database"""
+        return cls._database().delegate
+
+    @classmethod
+    async def _ensure_updated(cls):
+        """Sync the indexes and schema validators if required, without blocking the event loop"""
+        if cls._should_update():
+            await asyncio.get_event_loop().run_in_executor(None, cls._sync)
+
+    @classmethod
+    async def _updated_collection(cls):
+        """Get the collection associated with this model, ensuring it is up to date"""
+        await cls._ensure_updated()
+        return cls.c()
+
+    find_raw = _unsupported('find_raw')
+    find_raw_batches = _unsupported('find_raw_batches')
+    find_columns = _unsupported('find_columns')
+    export = _unsupported('export')
+    export_columns = _unsupported('export_columns')
+
+    @classmethod
+    def loader(cls, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        """Create a loader that batches lookups by ``_id`` made in the same event loop iteration
+
+        Returns:
+            pymongoext.loader.AsyncLoader
+        """
+        return AsyncLoader(cls, max_batch_size)
+
+    @classmethod
+    def find(cls, *args, **kwargs):
+        """Wrap find method
+
+        Returns:
+            AsyncWrappedCursor
+        """
+        return AsyncWrappedCursor(cls.c().find(*args, **kwargs), cls, _projection(args, kwargs, 1))
+
+    @classmethod
+    async def find_one(cls, *args, **kwargs):
+        """Wrap find_one method"""
+        collection = await cls._updated_collection()
+        doc = await collection.find_one(*args, **kwargs)
+        return cls.apply_outgoing_manipulators(doc, _projection(args, kwargs, 1))
+
+    @classmethod
+    async def find_one_and_delete(cls, filter, *args, **kwargs):
+        """Wrap find_one_and_delete method"""
+        collection = await cls._updated_collection()
+        doc = None
+        try:
+            doc = await collection.find_one_and_delete(filter, *args, **kwargs)
+            return cls.apply_outgoing_manipulators(doc, _projection(args, kwargs, 0))
+        finally:
+            _invalidate(cls, filter, doc)
+
+    @classmethod
+    async def find_one_and_replace(cls, filter, replacement, *args, **kwargs):
+        """Wrap find_one_and_replace method"""
+        replacement = cls.apply_incoming_manipulators(replacement, IncomingAction.REPLACE)
+        collection = await cls._updated_collection()
+        doc = None
+        try:
+            doc = await collection.find_one_and_replace(filter, replacement, *args, **kwargs)
+            return cls.apply_outgoing_manipulators(doc, _projection(args, kwargs, 0))
+        finally:
+            _invalidate(cls, filter, doc)
+
+    @classmethod
+    async def find_one_and_update(cls, filter, update, *args, **kwargs):
+        """Wrap find_one_and_update method"""
+        update = cls.apply_incoming_manipulators(update, IncomingAction.UPDATE)
+        collection = await cls._updated_collection()
+        doc = None
+        try:
+            doc = await collection.find_one_and_update(filter, update, *args, **kwargs)
+            return cls.apply_outgoing_manipulators(doc, _projection(args, kwargs, 0))
+        finally:
+            _invalidate(cls, filter, doc)
+
+    @classmethod
+    async def replace_one(cls, filter, replacement, *args, **kwargs):
+        """Wrap replace_one method"""
+        replacement = cls.apply_incoming_manipulators(replacement, IncomingAction.REPLACE)
+        collection = await cls._updated_collection()
+        try:
+            return await collection.replace_one(filter, replacement, *args, **kwargs)
+        finally:
+            _invalidate(cls, filter)
+
+    @classmethod
+    async def update_one(cls, filter, update, *args, **kwargs):
+        """Wrap update_one method"""
+        update = cls.apply_incoming_manipulators(update, IncomingAction.UPDATE)
+        collection = await cls._updated_collection()
+        try:
+            return await collection.update_one(filter, update, *args, **kwargs)
+        finally:
+            _invalidate(cls, filter)
+
+    @classmethod
+    async def update_many(cls, filter, update, *args, **kwargs):
+        """Wrap update_many method"""
+        update = cls.apply_incoming_manipulators(update, IncomingAction.UPDATE)
+        collection = await cls._updated_collection()
+        try:
+            return await collection.update_many(filter, update, *args, **kwargs)
+        finally:
+            _invalidate(cls, filter)
+
+    @classmethod
+    async def delete_one(cls, filter, *args, **kwargs):
+        """Wrap delete_one method"""
+        collection = await cls._updated_collection()
+        try:
+            return await collection.delete_one(filter, *args, **kwargs)
+        finally:
+            _invalidate(cls, filter)
+
+    @classmethod
+    async def delete_many(cls, filter, *args, **kwargs):
+        """Wrap delete_many method"""
+        collection = await cls._updated_collection()
+        try:
+            return await collection.delete_many(filter, *args, **kwargs)
+        finally:
+            _invalidate(cls, filter)
+
+    @classmethod
+    async def insert_one(cls, document, *args, **kwargs):
+        """Wrap insert_one method"""
+        document = cls.apply_incoming_manipulators(document, IncomingAction.CREATE)
+        collection = await cls._updated_collection()
+        result = await collection.insert_one(document, *args, **kwargs)
+        _invalidate(cls, result.inserted_id)
+        return result
+
+    @classmethod
+    async def insert_many(cls, documents, *args, chunk_size=None, executor=None, **kwargs):
+        """Wrap insert_many method
+
+        Raises:
+            NotImplementedError: If a ``chunk_size`` or an ``executor`` is given, they are not supported
+        """
+        if chunk_size is not None or executor is not None:
+            raise NotImplementedError('chunk_size and executor are not supported by AsyncModel.insert_many')
+        documents = [cls.apply_incoming_manipulators(d, IncomingAction.CREATE) for d in documents]
+        collection = await cls._updated_collection()
+        result = await collection.insert_many(documents, *args, **kwargs)
+        _invalidate_ids(cls, result.inserted_ids)
+        return result
+
+    @classmethod
+    async def bulk_write(cls, requests, *args, batch_size=None, **kwargs):
+        """Wrap bulk_write method. See :meth:`pymongoext.model.Model.bulk_write`
+
+        If ``batch_size`` is given, requests are sent in batches of at most ``batch_size`` operations
+        and a :class:`pymongoext.results.ChunkedBulkWriteResult` is returned.
+        """
+        collection = await cls._updated_collection()
+        try:
+            if batch_size is None:
+                requests = [_manipulate_request(cls, request) for request in requests]
+                return await collection.bulk_write(requests, *args, **kwargs)
+
+            ordered = kwargs.pop('ordered', True)
+            state = _BatchedBulkWrite(cls, requests, batch_size, ordered)
+            for batch, manipulate_time in state.batches():
+                start = time.perf_counter()
+                try:
+                    result = await collection.bulk_write(batch, ordered=ordered, **kwargs)
+                except BulkWriteError as e:
+                    state.record(batch, manipulate_time, time.perf_counter() - start, error=e)
+                else:
+                    state.record(batch, manipulate_time, time.perf_counter() - start, result=result)
+            return state.result()
+        finally:
+            _invalidate(cls)
+
+    @classmethod
+    async def exists(cls, filter=None, *args, **kwargs):
+        """Check if a document exists in the database. See :meth:`pymongoext.model.Model.exists`"""
+        if not args:
+            kwargs.setdefault('projection', {'_id': True})
+        await cls._ensure_updated()
+        docs = await cls._limited_cursor(filter, 1, *args, **kwargs).to_list(1)
+        return len(docs) > 0
+
+    @classmethod
+    async def get(cls, filter=None, *args, **kwargs):
+        """Retrieve the the matching object. See :meth:`pymongoext.model.Model.get`"""
+        await cls._ensure_updated()
+        docs = await cls._limited_cursor(filter, 2, *args, **kwargs).to_list(2)
+        if len(docs) < 1:
+            raise NoDocumentFound()
+        if len(docs) > 1:
+            raise MultipleDocumentsFound()
+        return cls.apply_outgoing_manipulators(docs[0], kwargs.get('projection', args[0] if args else None))
@@ -1,10 +1,38 @@
+import copy
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, count
+from pymongoext.cache import document_key
 from pymongoext.cursor import WrappedCursor
+from pymongoext.exceptions import DocumentManipulationError
 from pymongoext.manipulators import IncomingAction
+from pymongoext.results import ChunkTiming, ChunkedInsertManyResult, ChunkedBulkWriteResult
+from pymongo.errors import BulkWriteError
+from pymongo.operations import InsertOne, ReplaceOne, UpdateOne, UpdateMany
 from bson.py3compat import abc
 
 
-def _wrap_outgoing(method):
-	"""Helper method to wrap methods that return a single SON document"""
+def _projection(args, kwargs, index):
+	"""Extract the projection passed to a pymongo collection method
+
+	Args:
+		args (tuple): Positional arguments passed to the method
+		kwargs (dict): Keyword arguments passed to the method
+		index (int): Position of the projection in the positional arguments
+	"""
+	if 'projection' in kwargs:
+		return kwargs['projection']
+	return args[index] if len(args) > index else None
+
+
+def _wrap_outgoing(method, projection_index=1):
+	"""Helper method to wrap methods that return a single SON document
+
+	Args:
+		method (str): Name of the pymongo.Collection method
+		projection_index (int): Position of the projection in the positional arguments of the method
+	"""
 	def _wrapper(model, *args, **kwargs):
 		"""Retrieves document and passes it through outgoing manipulators
 
@@ -17,7 +45,54 @@ def _wrap_outgoing(method):
 			dict
 		"""
 		doc = getattr(model.c(), method)(*args, **kwargs)
-		return model.apply_outgoing_manipulators(doc)
+		return model.apply_outgoing_manipulators(doc, _projection(args, kwargs, projection_index))
+	return _wrapper
+
+
+def _invalidate(model, filter=None, doc=None):
+	"""Drop the documents a write may have modified from the cache of the model
+
+	If the filter does not match a single ``_id``, the whole cache is cleared.
+
+	Args:
+		model (pymongoext.model.Model): The associated model
+		filter: The filter of the write
+		doc (dict): The document returned by the write, if any
+	"""
+	cache = model.cache()
+	if cache is None:
+		return
+
+	key = document_key(filter)
+	if key is None:
+		cache.clear()
+	else:
+		cache.invalidate(key)
+
+	if doc is not None and '_id' in doc:
+		cache.invalidate(doc['_id'])
+
+
+def _invalidate_ids(model, ids):
+	"""Drop the documents with the given ``_id`` s from the cache of the model"""
+	cache = model.cache()
+	if cache is not None:
+		for _id in ids:
+			cache.invalidate(_id)
+
+
+def _wrap_write(method):
+	"""Helper method to wrap write methods that take a filter and do not manipulate documents"""
+	def _wrapper(cls, filter, *args, **kwargs):
+		"""Forwards the write and invalidates the cached documents
+
+		Args:
+			cls (pymongoext.model.Model)
+		"""
+		try:
+			return getattr(cls.c(), method)(filter, *args, **kwargs)
+		finally:
+			_invalidate(cls, filter)
 	return _wrapper
 
 
@@ -36,11 +111,307 @@ def _wrap_update(one_or_many):
 			cls (pymongoext.model.Model)
 		"""
 		update = cls.apply_incoming_manipulators(update, IncomingAction.UPDATE)
-		return getattr(cls.c(), method)(filter, update, *args, **kwargs)
+		try:
+			return getattr(cls.c(), method)(filter, update, *args, **kwargs)
+		finally:
+			_invalidate(cls, filter)
 
 	return _w_update_one_or_many
 
 
+_MANIPULATION_CHUNK_SIZE = 1000
+"""Number of documents manipulated per task when an executor is used without a chunk_size"""
+
+
+def _chunks(iterable, size):
+	"""Split an iterable into lists of at most ``size`` items without consuming it upfront"""
+	iterator = iter(iterable)
+	chunk = list(islice(iterator, size))
+	while chunk:
+		yield chunk
+		chunk = list(islice(iterator, size))
+
+
+def _timed(method, *args, **kwargs):
+	"""Call method and return a ``(result, duration)`` tuple"""
+	start = time.perf_counter()
+	result = method(*args, **kwargs)
+	return result, time.perf_counter() - start
+
+
+def _manipulate_chunk(model, offset, documents):
+	"""Apply incoming manipulators to a chunk of documents about to be inserted.
+
+	This is a module level function so that it can be sent to a process pool.
+
+	Args:
+		model (pymongoext.model.Model): The associated model
+		offset (int): Position of the first document of the chunk in the input
+		documents (list): The documents to manipulate
+
+	Returns:
+		(list, float): The manipulated documents and the time spent manipulating them
+
+	Raises:
+		pymongoext.exceptions.DocumentManipulationError: If a manipulator fails
+	"""
+	start = time.perf_counter()
+	manipulated = []
+	for i, doc in enumerate(documents):
+		try:
+			manipulated.append(model.apply_incoming_manipulators(doc, IncomingAction.CREATE))
+		except Exception as e:
+			raise DocumentManipulationError(offset + i, e) from e
+	return manipulated, time.perf_counter() - start
+
+
+def _manipulated_chunks(cls, documents, chunk_size, executor=None):
+	"""Yield ``(documents, manipulate_time)`` for each chunk of manipulated documents, in input order.
+
+	If an executor is given, chunks are manipulated by its workers.
+	Only a bounded window of chunks is submitted ahead of the one being consumed.
+
+	Args:
+		cls (pymongoext.model.Model)
+		documents (Iterable): The documents to manipulate
+		chunk_size (int): Number of documents per chunk
+		executor (concurrent.futures.Executor): Optional executor to run the manipulators on
+	"""
+	if chunk_size < 1:
+		raise ValueError('chunk_size must be a positive integer')
+
+	offsets = count(0, chunk_size)
+	if executor is None:
+		for offset, chunk in zip(offsets, _chunks(documents, chunk_size)):
+			yield _manipulate_chunk(cls, offset, chunk)
+		return
+
+	window = 2 * getattr(executor, '_max_workers', 1)
+	pending = deque()
+	for offset, chunk in zip(offsets, _chunks(documents, chunk_size)):
+		pending.append(executor.submit(_manipulate_chunk, cls, offset, chunk))
+		if len(pending) >= window:
+			yield pending.popleft().result()
+
+	while pending:
+		yield pending.popleft().result()
+
+
+def _insert_many_chunked(cls, documents, chunk_size, *args, executor=None, **kwargs):
+	"""Stream documents to the database in chunks of ``chunk_size``.
+
+	A chunk is sent on a background thread while the next chunk is being manipulated.
+	Without an executor, at most two chunks are held in memory at any time.
+
+	Args:
+		cls (pymongoext.model.Model)
+		documents (Iterable): The documents to insert. Can be any iterable, including a generator
+		chunk_size (int): Maximum number of documents per insert_many command
+		executor (concurrent.futures.Executor): Optional executor to run the manipulators on
+
+	Returns:
+		pymongoext.results.ChunkedInsertManyResult
+
+	Raises:
+		BulkWriteError: If a chunk fails. The indexes of its ``details["writeErrors"]`` refer to positions in
+			the input and the details also hold the ``insertedIds`` and the ``chunks`` timings of the documents
+			inserted before the error, including those of the failed chunk
+		pymongoext.exceptions.DocumentManipulationError: If a manipulator fails.
+			Its ``inserted_ids`` and ``chunks`` report the documents inserted before the error
+	"""
+	collection = cls.c()
+	ordered = args[0] if args else kwargs.get('ordered', True)
+	inserted_ids = []
+	timings = []
+	acknowledged = True
+
+	def _failed(error, chunk, offset):
+		details = error.details
+		failed = {item['index'] for item in details.get('writeErrors', [])}
+		if ordered and failed:
+			chunk = chunk[:min(failed)]
+		inserted_ids.extend(doc['_id'] for i, doc in enumerate(chunk) if i not in failed)
+
+		merged = _empty_bulk_api_result()
+		_merge_bulk_api_result(merged, details, offset)
+		merged.update(nInserted=len(inserted_ids), insertedIds=inserted_ids, chunks=timings)
+		return BulkWriteError(merged)
+
+	def _collect(pending):
+		nonlocal acknowledged
+		future, chunk, manipulate_time, offset, submitted = pending
+		try:
+			result, write_time = future.result()
+		except BulkWriteError as e:
+			timings.append(ChunkTiming(len(chunk), manipulate_time, time.perf_counter() - submitted))
+			raise _failed(e, chunk, offset) from e
+
+		inserted_ids.extend(result.inserted_ids)
+		acknowledged = acknowledged and result.acknowledged
+		timings.append(ChunkTiming(len(chunk), manipulate_time, write_time))
+
+	with ThreadPoolExecutor(max_workers=1) as writer:
+		pending = None
+		offset = 0
+		try:
+			for chunk, manipulate_time in _manipulated_chunks(cls, documents, chunk_size, executor):
+				if pending is not None:
+					collected, pending = pending, None
+					_collect(collected)
+					offset += len(collected[1])
+
+				future = writer.submit(_timed, collection.insert_many, chunk, *args, **kwargs)
+				pending = future, chunk, manipulate_time, offset, time.perf_counter()
+		except Exception as e:
+			# The chunk being written when reading or manipulating the input failed is still reported,
+			# its write error first
+			if pending is not None:
+				_collect(pending)
+			if isinstance(e, DocumentManipulationError):
+				e.inserted_ids = inserted_ids
+				e.chunks = timings
+			raise
+
+		if pending is not None:
+			_collect(pending)
+
+	return ChunkedInsertManyResult(inserted_ids, acknowledged, timings)
+
+
+_REQUEST_ACTIONS = (
+	(InsertOne, IncomingAction.CREATE),
+	(ReplaceOne, IncomingAction.REPLACE),
+	(UpdateOne, IncomingAction.UPDATE),
+	(UpdateMany, IncomingAction.UPDATE)
+)
+"""The incoming action applied to the document of each type of bulk write request"""
+
+
+def _manipulate_request(cls, request):
+	"""Returns a copy of a bulk write request whose document went through the incoming manipulators
+
+	Args:
+		cls (pymongoext.model.Model)
+		request: A pymongo write operation such as ``InsertOne`` or ``UpdateOne``
+	"""
+	for klass, action in _REQUEST_ACTIONS:
+		if isinstance(request, klass):
+			request = copy.copy(request)
+			request._doc = cls.apply_incoming_manipulators(request._doc, action)
+			break
+	return request
+
+
+def _empty_bulk_api_result():
+	"""Returns a bulk write result dict without any operation, to merge the results of batches into"""
+	return dict(
+		nInserted=0, nUpserted=0, nMatched=0, nModified=0, nRemoved=0,
+		upserted=[], writeErrors=[], writeConcernErrors=[]
+	)
+
+
+def _merge_bulk_api_result(merged, result, offset):
+	"""Add the result dict of a bulk write batch to the merged result, shifting indexes by ``offset``"""
+	for key in ('nInserted', 'nUpserted', 'nMatched', 'nModified', 'nRemoved'):
+		merged[key] += result.get(key, 0)
+
+	for key in ('upserted', 'writeErrors'):
+		merged[key].extend(dict(item, index=item['index'] + offset) for item in result.get(key, []))
+
+	merged['writeConcernErrors'].extend(result.get('writeConcernErrors', []))
+
+
+class _BatchedBulkWrite:
+	"""State of a bulk write sent in batches of at most ``batch_size`` operations.
+
+	Shared by the synchronous and asynchronous batched bulk writes, which only differ in how each batch is sent.
+
+	Args:
+		cls (pymongoext.model.Model)
+		requests (Iterable): The write operations
+		batch_size (int): Maximum number of operations per bulk_write command
+		ordered (bool): Passed on to bulk_write
+	"""
+
+	def __init__(self, cls, requests, batch_size, ordered):
+		if batch_size < 1:
+			raise ValueError('batch_size must be a positive integer')
+
+		self.cls = cls
+		self.requests = requests
+		self.batch_size = batch_size
+		self.ordered = ordered
+		self.merged = _empty_bulk_api_result()
+		self.timings = []
+		self.acknowledged = True
+		self.offset = 0
+
+	def batches(self):
+		"""Yields ``(batch, manipulate_time)`` tuples of manipulated requests"""
+		for batch in _chunks(self.requests, self.batch_size):
+			start = time.perf_counter()
+			batch = [_manipulate_request(self.cls, request) for request in batch]
+			yield batch, time.perf_counter() - start
+
+	def record(self, batch, manipulate_time, write_time, result=None, error=None):
+		"""Record the outcome of a batch
+
+		Raises:
+			BulkWriteError: If the batch failed and the write is ordered
+		"""
+		self.timings.append(ChunkTiming(len(batch), manipulate_time, write_time))
+		if error is not None:
+			_merge_bulk_api_result(self.merged, error.details, self.offset)
+			if self.ordered:
+				raise BulkWriteError(self.merged) from error
+		else:
+			self.acknowledged = self.acknowledged and result.acknowledged
+			if result.acknowledged:
+				_merge_bulk_api_result(self.merged, result.bulk_api_result, self.offset)
+		self.offset += len(batch)
+
+	def result(self):
+		"""Returns the merged result
+
+		Raises:
+			BulkWriteError: If any batch failed
+		"""
+		if self.merged['writeErrors'] or self.merged['writeConcernErrors']:
+			raise BulkWriteError(self.merged)
+		return ChunkedBulkWriteResult(self.merged, self.acknowledged, self.timings)
+
+
+def _bulk_write_batched(cls, requests, batch_size, ordered=True, **kwargs):
+	"""Manipulate and send bulk write requests in batches of at most ``batch_size`` operations.
+
+	With ``ordered=True``, a failing batch stops the remaining ones from being sent.
+	Otherwise all batches are sent and the errors are raised at the end.
+	In both cases the raised ``BulkWriteError`` carries the merged details of all the batches sent.
+
+	Args:
+		cls (pymongoext.model.Model)
+		requests (Iterable): The write operations
+		batch_size (int): Maximum number of operations per bulk_write command
+		ordered (bool): Passed on to bulk_write
+
+	Returns:
+		pymongoext.results.ChunkedBulkWriteResult
+	"""
+	state = _BatchedBulkWrite(cls, requests, batch_size, ordered)
+	collection = cls.c()
+
+	for batch, manipulate_time in state.batches():
+		start = time.perf_counter()
+		try:
+			result = collection.bulk_write(batch, ordered=ordered, **kwargs)
+		except BulkWriteError as e:
+			state.record(batch, manipulate_time, time.perf_counter() - start, error=e)
+		else:
+			state.record(batch, manipulate_time, time.perf_counter() - start, result=result)
+
+	return state.result()
+
+
 class _BindCollectionMethods(type):
 	"""Metaclass to bind class method calls to mongo collection instance"""
 	def __getattr__(self, item):
@@ -48,19 +419,92 @@ class _BindCollectionMethods(type):
 		if wrapper in _W_ATTRIBUTES:
 			return getattr(self, wrapper)
 
-		return self.c().__getattribute__(item)
+		return getattr(self.c(), item)
+
+	def __setattr__(cls, key, value):
+		super().__setattr__(key, value)
+		cls._invalidate_cache()
+
+	def __delattr__(cls, item):
+		super().__delattr__(item)
+		cls._invalidate_cache()
 
-	def _w_find(cls, *args, **kwargs):
+	def _w_find(cls, *args, lazy=False, **kwargs):
 		"""Wrap find method
 
 		Args:
 			cls (pymongoext.model.Model)
+			lazy (bool): If ``True``, the outgoing manipulators of each document are deferred until
+				the document is first accessed. See :class:`pymongoext.cursor.LazyDocument`
 		"""
 		cursor = cls.c().find(*args, **kwargs)
-		return WrappedCursor(cursor, cls)
+		return WrappedCursor(cursor, cls, lazy, projection=_projection(args, kwargs, 1))
+
+	def _w_find_raw(cls, *args, lazy=False, **kwargs):
+		"""Query the collection without decoding documents into dicts or applying manipulators.
+
+		Takes the same arguments as find. Documents are returned as ``bson.raw_bson.RawBSONDocument``
+		whose ``raw`` bytes can be forwarded as is.
+
+		Args:
+			cls (pymongoext.model.Model)
+			lazy (bool): If ``True``, documents are returned as :class:`pymongoext.raw.LazyBSONDocument`
+				which only decode the keys that are accessed
+
+		Returns:
+			pymongoext.cursor.WrappedCursor
+		"""
+		cursor = cls._raw_collection().find(*args, **kwargs)
+		return WrappedCursor(cursor, cls, lazy, raw=True)
+
+	def _w_find_raw_batches(cls, *args, **kwargs):
+		"""Wrap find_raw_batches method
+
+		Each item is the raw BSON bytes of a whole batch. No manipulators are applied.
+
+		Args:
+			cls (pymongoext.model.Model)
+
+		Returns:
+			pymongoext.cursor.WrappedCursor
+		"""
+		cursor = cls.c().find_raw_batches(*args, **kwargs)
+		return WrappedCursor(cursor, cls, raw=True)
+
+	def _w_find_one(cls, filter=None, *args, **kwargs):
+		"""Wrap find_one method
+
+		If the model :attr:`~pymongoext.model.Model.__cache__` is enabled,
+		documents requested by ``_id`` alone are served from the cache.
+
+		Args:
+			cls (pymongoext.model.Model)
+		"""
+		cache = cls.cache()
+		key = None if cache is None or args or kwargs else document_key(filter)
+		if key is not None:
+			generation = cache.generation
+			doc = cache.get(key)
+			if doc is not None:
+				return doc
+
+		doc = _wrap_outgoing('find_one')(cls, filter, *args, **kwargs)
+		if key is not None and doc is not None:
+			cache.set(key, doc, generation)
+		return doc
+
+	def _w_find_one_and_delete(cls, filter, *args, **kwargs):
+		"""Wrap find_one_and_delete method
 
-	_w_find_one = _wrap_outgoing('find_one')
-	_w_find_one_and_delete = _wrap_outgoing('find_one_and_delete')
+		Args:
+			cls (pymongoext.model.Model)
+		"""
+		doc = None
+		try:
+			doc = _wrap_outgoing('find_one_and_delete')(cls, filter, *args, **kwargs)
+			return doc
+		finally:
+			_invalidate(cls, filter, doc)
 
 	def _w_find_one_and_replace(cls, filter, replacement, *args, **kwargs):
 		"""Wrap find_one_and_replace method
@@ -69,7 +513,12 @@ class _BindCollectionMethods(type):
 			cls (pymongoext.model.Model)
 		"""
 		replacement = cls.apply_incoming_manipulators(replacement, IncomingAction.REPLACE)
-		return _wrap_outgoing('find_one_and_replace')(cls, filter, replacement, *args, **kwargs)
+		doc = None
+		try:
+			doc = _wrap_outgoing('find_one_and_replace', 2)(cls, filter, replacement, *args, **kwargs)
+			return doc
+		finally:
+			_invalidate(cls, filter, doc)
 
 	def _w_replace_one(cls, filter, replacement, *args, **kwargs):
 		"""Wrap replace_one method
@@ -78,7 +527,10 @@ class _BindCollectionMethods(type):
 			cls (pymongoext.model.Model)
 		"""
 		replacement = cls.apply_incoming_manipulators(replacement, IncomingAction.REPLACE)
-		return cls.c().replace_one(filter, replacement, *args, **kwargs)
+		try:
+			return cls.c().replace_one(filter, replacement, *args, **kwargs)
+		finally:
+			_invalidate(cls, filter)
 
 	def _w_find_one_and_update(cls, filter, update, *args, **kwargs):
 		"""Wrap find_one_and_update method
@@ -87,11 +539,45 @@ class _BindCollectionMethods(type):
 			cls (pymongoext.model.Model)
 		"""
 		update = cls.apply_incoming_manipulators(update, IncomingAction.UPDATE)
-		return _wrap_outgoing('find_one_and_update')(cls, filter, update, *args, **kwargs)
+		doc = None
+		try:
+			doc = _wrap_outgoing('find_one_and_update', 2)(cls, filter, update, *args, **kwargs)
+			return doc
+		finally:
+			_invalidate(cls, filter, doc)
+
+	_w_delete_one = _wrap_write('delete_one')
+	_w_delete_many = _wrap_write('delete_many')
 
 	_w_update_one = _wrap_update('one')
 	_w_update_many = _wrap_update('many')
 
+	def _w_bulk_write(cls, requests, *args, batch_size=None, **kwargs):
+		"""Wrap bulk_write method
+
+		The document of each ``InsertOne``, ``ReplaceOne``, ``UpdateOne`` and ``UpdateMany`` request
+		is passed through the incoming manipulators with the matching :class:`IncomingAction`.
+
+		If ``batch_size`` is given, requests can be any iterable and are sent in batches of at most
+		``batch_size`` operations. A :class:`pymongoext.results.ChunkedBulkWriteResult` aggregating
+		the results and timings of all batches is then returned.
+
+		Args:
+			cls (pymongoext.model.Model)
+			batch_size (int): Maximum number of operations per bulk_write command
+		"""
+		if batch_size is not None:
+			try:
+				return _bulk_write_batched(cls, requests, batch_size, *args, **kwargs)
+			finally:
+				_invalidate(cls)
+
+		requests = [_manipulate_request(cls, request) for request in requests]
+		try:
+			return cls.c().bulk_write(requests, *args, **kwargs)
+		finally:
+			_invalidate(cls)
+
 	def _w_insert_one(cls, document, *args, **kwargs):
 		"""Wrap insert_one method
 
@@ -99,17 +585,62 @@ class _BindCollectionMethods(type):
 			cls (pymongoext.model.Model)
 		"""
 		document = cls.apply_incoming_manipulators(document, IncomingAction.CREATE)
-		return cls.c().insert_one(document, *args, **kwargs)
+		result = cls.c().insert_one(document, *args, **kwargs)
+		_invalidate(cls, result.inserted_id)
+		return result
 
-	def _w_insert_many(cls, documents, *args, **kwargs):
+	def _w_insert_many(cls, documents, *args, chunk_size=None, executor=None, **kwargs):
 		"""Wrap insert_many method
 
+		If ``chunk_size`` is given, documents are manipulated and inserted in chunks as they are consumed
+		from ``documents``, which can then be any iterable including a generator.
+		Memory usage stays bounded by the chunk size and a
+		:class:`pymongoext.results.ChunkedInsertManyResult` is returned.
+		If a chunk fails to insert, a ``BulkWriteError`` is raised and the remaining chunks are not sent.
+		Its details report the positions of the failed documents in the input
+		and hold the ``insertedIds`` and ``chunks`` of the documents inserted before the error.
+
+		If an ``executor`` is given, the incoming manipulators are applied to chunks of documents
+		on its workers and the results are reassembled in input order.
+		When using a ``ProcessPoolExecutor``, the model and the documents must be picklable,
+		i.e. the model must be defined at the top level of a module.
+
 		Args:
 			cls (pymongoext.model.Model)
+			chunk_size (int): Maximum number of documents to send per insert_many command
+			executor (concurrent.futures.Executor): Thread or process pool to run the manipulators on
+
+		Raises:
+			pymongoext.exceptions.DocumentManipulationError: If a manipulator fails
+				while using a ``chunk_size`` or an ``executor``
 		"""
-		if documents and isinstance(documents, abc.Iterable):
-			documents = [cls.apply_incoming_manipulators(d, IncomingAction.CREATE) for d in documents]
-		return cls.c().insert_many(documents, *args, **kwargs)
+		if chunk_size is not None:
+			inserted_ids = None
+			try:
+				result = _insert_many_chunked(cls, documents, chunk_size, *args, executor=executor, **kwargs)
+				inserted_ids = result.inserted_ids
+				return result
+			except BulkWriteError as e:
+				inserted_ids = e.details['insertedIds']
+				raise
+			except DocumentManipulationError as e:
+				inserted_ids = e.inserted_ids
+				raise
+			finally:
+				if inserted_ids is None:
+					# Any of the documents may have been written
+					_invalidate(cls)
+				else:
+					_invalidate_ids(cls, inserted_ids)
 
+		if executor is not None and documents and isinstance(documents, abc.Iterable):
+			chunks = _manipulated_chunks(cls, documents, _MANIPULATION_CHUNK_SIZE, executor)
+			documents = [doc for chunk, _ in chunks for doc in chunk]
+
+		elif documents and isinstance(documents, abc.Iterable):
+			documents = [cls.apply_incoming_manipulators(d, IncomingAction.CREATE) for d in documents]
+		result = cls.c().insert_many(documents, *args, **kwargs)
+		_invalidate_ids(cls, result.inserted_ids)
+		return result
 
 _W_ATTRIBUTES = [x for x in _BindCollectionMethods.__dict__.keys() if x.startswith('_w_')]
@@ -0,0 +1,314 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from pymongo.errors import OperationFailure
+
+__all__ = [
+    'CacheStats',
+    'DocumentCache',
+    'CacheInvalidator',
+    'document_key'
+]
+
+_logger = logging.getLogger(__name__)
+
+_DOCUMENT_EVENTS = ('insert', 'update', 'replace', 'delete')
+"""Change events that affect a single document"""
+
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'size'])
+"""Counters of a :class:`DocumentCache`
+
+Attributes:
+    hits (int): Number of lookups that found a fresh document
+    misses (int): Number of lookups that found no document or an expired one
+    evictions (int): Number of documents dropped to respect ``maxsize`` or because they expired
+    size (int): Number of documents currently cached
+"""
+
+_MISSING = object()
+
+
+def document_key(filter):
+    """Returns the ``_id`` a filter matches exactly, or ``None`` if it may match other documents
+
+    Args:
+        filter: A dict filter or any other type to be used as the value for a query for ``"_id"``
+    """
+    if filter is None:
+        return None
+
+    if isinstance(filter, Mapping):
+        if len(filter) != 1 or '_id' not in filter:
+            return None
+        filter = filter['_id']
+        if isinstance(filter, Mapping):
+            return None
+
+    try:
+        hash(filter)
+    except TypeError:
+        return None
+    return filter
+
+
+class DocumentCache:
+    """A thread safe LRU cache of documents keyed by ``_id`` with an optional time to live.
+
+    Documents are copied when stored and when retrieved, so callers can modify them freely.
+    See :attr:`pymongoext.model.Model.__cache__` on how to enable it on a model.
+
+    To fill the cache after a miss without racing concurrent writes, read :attr:`~generation` before
+    querying the database and pass it to :meth:`~set`. The document is then only stored
+    if nothing was invalidated in between.
+
+    Args:
+        maxsize (int): Maximum number of documents to keep
+        ttl (float): Number of seconds a document stays fresh. If ``None``, documents do not expire
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive integer')
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        """Get a copy of the cached document with the given ``_id``
+
+        Returns:
+            The document or ``default`` if it is not cached or has expired
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and self.ttl is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                self._evictions += 1
+                entry = _MISSING
+
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            doc = entry[1]
+
+        return copy.deepcopy(doc)
+
+    @property
+    def generation(self):
+        """int: Incremented whenever documents are invalidated or the cache is cleared"""
+        return self._generation
+
+    def set(self, key, doc, generation=None):
+        """Store a copy of a document under the given ``_id``, evicting the least recently used if full
+
+        Args:
+            key: The ``_id`` of the document
+            doc (dict): The document
+            generation (int): The :attr:`~generation` read before the document was retrieved.
+                If given and any document has been invalidated since, the document may be stale and is not stored
+        """
+        doc = copy.deepcopy(doc)
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = (expires, doc)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key):
+        """Drop the document with the given ``_id``"""
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop all documents"""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self):
+        """Returns the cache counters
+
+        Returns:
+            CacheStats
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._data))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CacheInvalidator:
+    """Keeps the document cache of a model coherent with writes made by other processes.
+
+    A daemon thread tails the change stream of the collection and evicts the cached documents that change.
+    Drop, rename and invalidate events clear the whole cache.
+    After a disconnect, the stream is resumed from the last resume token.
+    If it cannot be resumed, a new stream is opened.
+    Whenever a stream is opened without a resume token, including the first one, the cache is cleared
+    since the changes made before it was opened are unknown.
+    Streams are reopened after ``retry_delay`` seconds, doubled after each stream that yields no event
+    up to ``max_retry_delay``.
+
+    Usually created through :meth:`pymongoext.model.Model.watch_cache`.
+
+    Args:
+        model (pymongoext.model.Model): The model whose cache to keep coherent
+        source (callable): Called with the resume token, or ``None``, to open a change stream.
+            Any iterable of change events can be returned, which allows using a local fake in place of MongoDB.
+            Defaults to watching the collection of the model
+        refresh (bool): If ``True``, cached documents are replaced by the full document of
+            update and replace events instead of being evicted
+        retry_delay (float): Seconds to wait before reopening a stream that ended or failed
+        max_retry_delay (float): Maximum seconds to wait before reopening a stream
+    """
+
+    def __init__(self, model, source=None, refresh=False, retry_delay=1.0, max_retry_delay=60.0):
+        self.model = model
+        if model.cache() is None:
+            raise ValueError('Caching is not enabled on {}. See Model.__cache__'.format(model.__name__))
+
+        self.source = self._watch if source is None else source
+        self.refresh = refresh
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.resume_token = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def cache(self):
+        """DocumentCache: The current cache of the model"""
+        return self.model.cache()
+
+    def _watch(self, resume_after):
+        """Open a change stream on the collection of the model"""
+        kwargs = dict(resume_after=resume_after, max_await_time_ms=1000)
+        if self.refresh:
+            kwargs['full_document'] = 'updateLookup'
+        return self.model.c().watch(**kwargs)
+
+    def start(self):
+        """Start tailing the change stream in a daemon thread
+
+        Returns:
+            CacheInvalidator: self
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='pymongoext-cache-{}'.format(self.model.name()),
+                daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop tailing the change stream and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        """bool: ``True`` if the thread is tailing the change stream"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def handle(self, change):
+        """Apply a change event to the cache"""
+        operation = change.get('operationType')
+        cache = self.cache
+        if cache is None:
+            return
+
+        if operation in _DOCUMENT_EVENTS:
+            key = change.get('documentKey', {}).get('_id')
+            document = change.get('fullDocument')
+            if self.refresh and document is not None and key in cache:
+                cache.set(key, self.model.apply_outgoing_manipulators(document))
+            else:
+                cache.invalidate(key)
+        else:
+            cache.clear()
+            if operation == 'invalidate':
+                self.resume_token = None
+
+    def _clear(self):
+        cache = self.cache
+        if cache is not None:
+            cache.clear()
+
+    def _run(self):
+        delay = self.retry_delay
+        while not self._stop.is_set():
+            stream = None
+            handled = 0
+            try:
+                resumed = self.resume_token is not None
+                stream = self.source(self.resume_token)
+                if not resumed:
+                    self._clear()
+                handled = self._consume(stream)
+            except OperationFailure:
+                # The stream cannot be resumed, the next stream clears the cache
+                _logger.warning('Change stream of %s lost, clearing the cache', self.model.name(), exc_info=True)
+                self.resume_token = None
+            except Exception:
+                _logger.warning('Change stream of %s interrupted, resuming', self.model.name(), exc_info=True)
+            finally:
+                if stream is not None and hasattr(stream, 'close'):
+                    stream.close()
+
+            delay = self.retry_delay if handled else min(delay * 2, self.max_retry_delay)
+            self._stop.wait(delay)
+
+    def _consume(self, stream):
+        """Apply the events of a change stream until it ends or the invalidator is stopped
+
+        Returns:
+            int: The number of events applied
+        """
+        try_next = getattr(stream, 'try_next', None)
+        iterator = None if try_next is not None else iter(stream)
+        handled = 0
+
+        while not self._stop.is_set():
+            if try_next is not None:
+                change = try_next()
+                if change is None:
+                    if not getattr(stream, 'alive', True):
+                        return handled
+                    continue
+            else:
+                change = next(iterator, None)
+                if change is None:
+                    return handled
+
+            self.handle(change)
+            handled += 1
+            if change.get('operationType') != 'invalidate':
+                self.resume_token = getattr(stream, 'resume_token', None) or change.get('_id')
+        return handled
@@ -0,0 +1,206 @@
+from collections import namedtuple
+from datetime import timezone
+import bson
+from pymongoext.fields import DictField, IntField, NumberField, BooleanField, DateTimeField, ObjectIDField
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = [
+    'Column',
+    'schema_columns',
+    'projection',
+    'ColumnBuilder'
+]
+
+_ID = '_id'
+
+_DTYPES = (
+    (IntField, 'int64'),
+    (NumberField, 'float64'),
+    (BooleanField, 'bool'),
+    (DateTimeField, 'datetime64[ms]'),
+    (ObjectIDField, 'S12'),
+)
+"""NumPy dtype of each field type, the first matching type is used"""
+
+
+def _dtype(field):
+    for field_type, dtype in _DTYPES:
+        if isinstance(field, field_type):
+            return dtype
+    return 'object'
+
+
+def _to_datetime64(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return numpy.datetime64(value, 'ms')
+
+
+def _to_object_id_bytes(value):
+    if not isinstance(value, bson.ObjectId):
+        value = bson.ObjectId(value)
+    return value.binary
+
+
+_CONVERTERS = {
+    'int64': int,
+    'float64': float,
+    'bool': bool,
+    'datetime64[ms]': _to_datetime64,
+    'S12': _to_object_id_bytes,
+}
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('numpy is required for columnar results. Install it with `pip install numpy`')
+
+
+class Column(namedtuple('Column', ['name', 'field', 'dtype'])):
+    """A column of a tabular export
+
+    Attributes:
+        name (str): The name of the column, a field name or a dotted path into embedded documents
+        field (pymongoext.fields.Field): The schema field of the column or ``None`` if unknown
+        dtype (str): The NumPy dtype of the column
+    """
+
+    __slots__ = ()
+
+    def get(self, doc):
+        """Get the value of this column in a document or ``None`` if missing"""
+        for key in self.name.split('.'):
+            try:
+                doc = doc[key]
+            except (KeyError, TypeError):
+                return None
+            if doc is None:
+                return None
+        return doc
+
+
+def _field_at(schema, path):
+    """Find the field of a dotted path, walking the ``props`` of nested :class:`pymongoext.fields.DictField`"""
+    field = schema
+    for key in path.split('.'):
+        if not isinstance(field, DictField):
+            return None
+        props = field.props or {}
+        if key not in props:
+            return ObjectIDField() if field is schema and key == _ID else None
+        field = props[key]
+    return field
+
+
+def schema_columns(schema, fields=None):
+    """Get the columns of a tabular export
+
+    Args:
+        schema (pymongoext.fields.DictField): The schema of the model
+        fields (list of str): The columns to export, in order. Defaults to ``_id`` followed by the properties of the schema
+
+    Returns:
+        list of Column
+    """
+    if fields is None:
+        if not isinstance(schema, DictField) or not schema.props:
+            raise ValueError('fields must be specified for models without schema properties')
+        fields = [_ID] + [key for key in schema.props if key != _ID]
+
+    columns = []
+    for name in fields:
+        field = _field_at(schema, name)
+        columns.append(Column(name, field, _dtype(field)))
+    return columns
+
+
+def projection(columns):
+    """Get the projection retrieving only the given columns"""
+    proj = {column.name: True for column in columns}
+    proj.setdefault(_ID, False)
+    return proj
+
+
+class ColumnBuilder:
+    """Fills typed NumPy arrays with the column values of documents.
+
+    Missing and ``null`` values are masked. Values are converted to the dtype of their column:
+    datetimes to ``datetime64[ms]`` in UTC and ObjectIds to their 12 bytes.
+    The arrays grow geometrically when more rows than the allocated capacity are added.
+
+    Args:
+        columns (list of Column): The columns to fill
+        capacity (int): The number of rows to allocate
+    """
+
+    def __init__(self, columns, capacity):
+        _require_numpy()
+        self.columns = columns
+        self.size = 0
+        self._data = [self._allocate(column.dtype, capacity) for column in columns]
+        self._masks = [numpy.zeros(capacity, dtype=bool) for _ in columns]
+
+    @staticmethod
+    def _allocate(dtype, capacity):
+        if dtype == 'object':
+            return numpy.full(capacity, None, dtype=object)
+        return numpy.zeros(capacity, dtype=dtype)
+
+    @property
+    def capacity(self):
+        """int: The number of rows allocated"""
+        return len(self._masks[0]) if self._masks else 0
+
+    def _reserve(self, size):
+        """Grow the arrays to hold at least ``size`` rows"""
+        capacity = self.capacity
+        if size <= capacity:
+            return
+
+        capacity = max(size, capacity * 2)
+        for i, column in enumerate(self.columns):
+            data = self._allocate(column.dtype, capacity)
+            data[:self.size] = self._data[i][:self.size]
+            self._data[i] = data
+
+            mask = numpy.zeros(capacity, dtype=bool)
+            mask[:self.size] = self._masks[i][:self.size]
+            self._masks[i] = mask
+
+    def extend(self, docs):
+        """Append the values of a batch of documents
+
+        Args:
+            docs (list of dict): The documents
+        """
+        start = self.size
+        self._reserve(start + len(docs))
+        for column, data, mask in zip(self.columns, self._data, self._masks):
+            get = column.get
+            convert = _CONVERTERS.get(column.dtype)
+            for i, doc in enumerate(docs, start):
+                value = get(doc)
+                if value is None:
+                    mask[i] = True
+                else:
+                    data[i] = value if convert is None else convert(value)
+        self.size = start + len(docs)
+
+    def finish(self):
+        """Get the filled columns
+
+        Returns:
+            dict of str: numpy.ma.MaskedArray: The values of each column by name
+        """
+        size = self.size
+        trim = size < self.capacity
+        result = {}
+        for column, data, mask in zip(self.columns, self._data, self._masks):
+            # Release the unused capacity
+            data, mask = (data[:size].copy(), mask[:size].copy()) if trim else (data, mask)
+            result[column.name] = numpy.ma.MaskedArray(data, mask=mask if mask.any() else numpy.ma.nomask)
+        return result
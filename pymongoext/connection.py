@@ -0,0 +1,127 @@
+import os
+import threading
+from pymongo import MongoClient
+
+__all__ = [
+    'DEFAULT_ALIAS',
+    'register_connection',
+    'get_client',
+    'get_database',
+    'disconnect',
+    'reset'
+]
+
+DEFAULT_ALIAS = 'default'
+
+_lock = threading.Lock()
+_settings = {}
+_clients = {}
+_generation = 0
+
+
+def register_connection(db, alias=DEFAULT_ALIAS, client_class=MongoClient, **kwargs):
+    """Register the settings of a connection.
+
+    The client is created on first use and then shared by every model using the same alias.
+    Models select a connection by setting :attr:`pymongoext.model.Model.__connection_alias__`.
+
+    Example:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from pymongoext import Model, register_connection
+
+            register_connection('my_database_name', host='mongodb://localhost:27017', maxPoolSize=50)
+
+            class User(Model):
+                __connection_alias__ = 'default'
+
+    Args:
+        db (str): Name of the database
+        alias (str): Name used to refer to this connection
+        client_class (type): The client to create. Use ``motor.motor_asyncio.AsyncIOMotorClient``
+            for :class:`pymongoext.aio.AsyncModel`
+        **kwargs: Arguments to pass to the client
+    """
+    global _generation
+    with _lock:
+        client = _clients.pop(alias, None)
+        _settings[alias] = (db, client_class, kwargs)
+        _generation += 1
+
+    if client is not None:
+        client.close()
+
+
+def get_client(alias=DEFAULT_ALIAS):
+    """Get the shared client of a registered connection, creating it if necessary
+
+    Args:
+        alias (str): The connection alias
+
+    Returns:
+        pymongo.MongoClient
+    """
+    try:
+        return _clients[alias]
+    except KeyError:
+        pass
+
+    with _lock:
+        if alias not in _clients:
+            try:
+                _, client_class, kwargs = _settings[alias]
+            except KeyError:
+                raise KeyError('No connection registered with alias {!r}'.format(alias)) from None
+            _clients[alias] = client_class(**kwargs)
+        return _clients[alias]
+
+
+def get_database(alias=DEFAULT_ALIAS):
+    """Get the database of a registered connection
+
+    Args:
+        alias (str): The connection alias
+
+    Returns:
+        pymongo.database.Database
+    """
+    return get_client(alias)[_settings[alias][0]]
+
+
+def disconnect(alias=None):
+    """Close the clients of the given connection, or of all connections if ``alias`` is ``None``.
+
+    The clients are recreated on next use and models resolve their collections again.
+    """
+    global _generation
+    with _lock:
+        aliases = list(_clients) if alias is None else [alias]
+        clients = [_clients.pop(a) for a in aliases if a in _clients]
+        _generation += 1
+
+    for client in clients:
+        client.close()
+
+
+def reset():
+    """Drop all clients without closing them and invalidate the collections cached by models.
+
+    Clients must not be used across a fork.
+    This is called automatically in the child process after ``os.fork()``
+    and can be called explicitly when forking by other means.
+    """
+    global _generation, _lock
+    _lock = threading.Lock()
+    _clients.clear()
+    _generation += 1
+
+
+def generation():
+    """Returns a number that changes every time a connection is registered or the clients are disconnected or reset"""
+    return _generation
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset)
@@ -1,41 +1,306 @@
+import copy
+from collections import deque
+from collections.abc import MutableMapping
 from pymongo.cursor import Cursor
+from pymongoext.raw import LazyBSONDocument
+
+
+def _take_buffered(cursor):
+	"""Take the documents that pymongo has already fetched into the buffer of the cursor.
+
+	Returns an empty list if the buffer of the cursor is not accessible.
+	"""
+	data = getattr(cursor, '_Cursor__data', None)
+	if data is None:
+		data = getattr(cursor, '_data', None)
+
+	if not isinstance(data, deque):
+		return []
+
+	docs = list(data)
+	data.clear()
+	return docs
+
+
+class LazyDocument(MutableMapping):
+	"""A document whose outgoing manipulators are applied on first access.
+
+	Documents that are never read, for example when only counting rows, are never manipulated.
+	Item and attribute access are forwarded to the manipulated document,
+	so attribute access works as usual when the :class:`~pymongoext.manipulators.MunchManipulator` is used.
+	Copying a lazy document returns a copy of the manipulated document.
+
+	Args:
+		doc (dict): The document as retrieved from the database
+		model (pymongoext.model.Model): The associated model
+		projection (dict|list): The projection the document was retrieved with
+		pipelines: The manipulator pipelines of the model for the projection, shared by the documents of a query.
+			Resolved from ``projection`` if not given
+	"""
+
+	__slots__ = ('_raw', '_model', '_projection', '_pipelines', '_doc')
+
+	def __init__(self, doc, model, projection=None, pipelines=None):
+		self._raw = doc
+		self._model = model
+		self._projection = projection
+		self._pipelines = pipelines
+		self._doc = None
+
+	def unwrap(self):
+		"""Apply the outgoing manipulators if not done yet and return the manipulated document"""
+		if self._doc is None:
+			pipelines = self._pipelines
+			if pipelines is None:
+				pipelines = self._model._pipelines(self._projection)
+			self._doc = pipelines.apply_outgoing(self._raw, self._model)
+			self._raw = None
+		return self._doc
+
+	@property
+	def is_manipulated(self):
+		"""bool: ``True`` if the outgoing manipulators have been applied"""
+		return self._doc is not None
+
+	def __getitem__(self, key):
+		return self.unwrap()[key]
+
+	def __setitem__(self, key, value):
+		self.unwrap()[key] = value
+
+	def __delitem__(self, key):
+		del self.unwrap()[key]
+
+	def __iter__(self):
+		return iter(self.unwrap())
+
+	def __len__(self):
+		return len(self.unwrap())
+
+	def __contains__(self, key):
+		return key in self.unwrap()
+
+	def __getattr__(self, item):
+		# Special names, probed by copy and pickle, are resolved on the wrapper itself.
+		# Forwarding them would recurse when the slots are not set yet
+		if item.startswith('__') and item.endswith('__'):
+			raise AttributeError(item)
+		return getattr(self.unwrap(), item)
+
+	def __copy__(self):
+		return copy.copy(self.unwrap())
+
+	def __deepcopy__(self, memo):
+		return copy.deepcopy(self.unwrap(), memo)
+
+	def __repr__(self):
+		return '{}({!r})'.format(type(self).__name__, self.unwrap())
+
+
+def _chain(name):
+	"""Create a method that forwards to the chainable cursor method ``name`` and returns the wrapper"""
+	def _method(self, *args, **kwargs):
+		getattr(self.cursor, name)(*args, **kwargs)
+		return self
+
+	_method.__name__ = name
+	_method.__doc__ = 'Forwards to ``pymongo.cursor.Cursor.{}`` and returns this cursor'.format(name)
+	return _method
 
 
 class WrappedCursor:
-	def __init__(self, cursor, model):
-		"""Wraps pymongo cursor
+	"""Wraps pymongo cursor
 
-		Args:
-			cursor (Cursor): The underlying pymongo cursor
-			model (pymongoext.model.Model): The associated model
-		"""
+	The common chainable methods (``limit``, ``sort``, ``skip`` ...) are forwarded to the pymongo cursor
+	and return the same wrapper. Other attributes are resolved on the pymongo cursor.
+
+	Args:
+		cursor (Cursor): The underlying pymongo cursor
+		model (pymongoext.model.Model): The associated model
+		lazy (bool): If ``True``, documents are returned as :class:`~LazyDocument`,
+			or as :class:`pymongoext.raw.LazyBSONDocument` if ``raw`` is ``True``
+		raw (bool): If ``True``, documents are returned as retrieved, without applying the outgoing manipulators
+		projection (dict|list): The projection of the query, passed on to the outgoing manipulators
+	"""
+
+	__slots__ = ('cursor', 'model', 'lazy', 'raw', 'projection', '_batch', '_pipelines')
+
+	def __init__(self, cursor, model, lazy=False, raw=False, projection=None):
 		self.cursor = cursor
 		self.model = model
+		self.lazy = lazy
+		self.raw = raw
+		self.projection = projection
+		self._batch = deque()
+		self._pipelines = None
+
+	add_option = _chain('add_option')
+	remove_option = _chain('remove_option')
+	allow_disk_use = _chain('allow_disk_use')
+	limit = _chain('limit')
+	batch_size = _chain('batch_size')
+	skip = _chain('skip')
+	max_time_ms = _chain('max_time_ms')
+	max_await_time_ms = _chain('max_await_time_ms')
+	sort = _chain('sort')
+	hint = _chain('hint')
+	comment = _chain('comment')
+	where = _chain('where')
+	collation = _chain('collation')
+	max = _chain('max')
+	min = _chain('min')
 
 	def __getattr__(self, item):
-		def _wrap(method):
-			def _wrapper(*args, **kwargs):
-				res = method(*args, **kwargs)
-				if isinstance(res, Cursor):
-					return WrappedCursor(res, model)
-				return res
-			return _wrapper
+		def _wrapper(*args, **kwargs):
+			res = attr(*args, **kwargs)
+			if isinstance(res, Cursor):
+				return self._wrap(res)
+			return res
 
-		model = self.model
 		attr = getattr(self.cursor, item)
-		return _wrap(attr) if callable(attr) else attr
+		return _wrapper if callable(attr) else attr
+
+	@property
+	def alive(self):
+		"""bool: Does this cursor have the potential to return more data?
+
+		Unlike ``pymongo.cursor.Cursor.alive``, documents already fetched into the local buffer are counted.
+		"""
+		return bool(self._batch) or self.cursor.alive
+
+	@property
+	def retrieved(self):
+		"""int: The number of documents retrieved from the server so far, including those not yet returned"""
+		return self.cursor.retrieved
+
+	def _outgoing(self):
+		"""Returns the manipulator pipelines for the projection of this cursor, resolved once"""
+		if self._pipelines is None:
+			self._pipelines = self.model._pipelines(self.projection)
+		return self._pipelines
+
+	def _wrap(self, cursor):
+		"""Wrap another pymongo cursor with the same settings as this one"""
+		return WrappedCursor(cursor, self.model, self.lazy, self.raw, self.projection)
+
+	def _fill(self):
+		"""Fetch the next batch of documents into the local buffer, applying the outgoing manipulators.
+
+		Returns:
+			bool: ``False`` if the cursor is exhausted
+		"""
+		try:
+			doc = self.cursor.next()
+		except StopIteration:
+			return False
+
+		docs = _take_buffered(self.cursor)
+		model = self.model
+
+		if self.raw:
+			docs.insert(0, doc)
+			if self.lazy:
+				codec_options = self.cursor.collection.codec_options
+				docs = [LazyBSONDocument(d.raw, codec_options) for d in docs]
+			self._batch.extend(docs)
+
+		elif self.lazy:
+			projection = self.projection
+			pipelines = self._outgoing()
+			self._batch.append(LazyDocument(doc, model, projection, pipelines))
+			self._batch.extend(LazyDocument(d, model, projection, pipelines) for d in docs)
+
+		elif not docs:
+			self._batch.append(self._outgoing().apply_outgoing(doc, model))
+
+		else:
+			docs.insert(0, doc)
+			self._batch.extend(self._outgoing().apply_outgoing_batch(docs, model))
+
+		return True
 
 	def next(self):
-		doc = self.cursor.next()
-		return self.model.apply_outgoing_manipulators(doc)
+		"""Return the next document.
+
+		Unless the cursor is lazy, the documents of each batch fetched from the server are
+		manipulated together, see :meth:`pymongoext.model.Model.apply_outgoing_manipulators_batch`
+		"""
+		if not self._batch and not self._fill():
+			raise StopIteration
+		return self._batch.popleft()
+
+	def to_list(self, length=None):
+		"""Retrieve up to ``length`` documents as a list, or all remaining documents if ``length`` is ``None``.
+
+		Documents are pulled and manipulated a whole batch at a time.
+		Documents fetched beyond ``length`` are kept for subsequent calls.
+
+		Args:
+			length (int): Maximum number of documents to retrieve
+
+		Returns:
+			list
+		"""
+		batch = self._batch
+		if length is None:
+			while self._fill():
+				pass
+			docs = list(batch)
+			batch.clear()
+			return docs
+
+		docs = []
+		while len(docs) < length and (batch or self._fill()):
+			take = min(length - len(docs), len(batch))
+			docs.extend(batch.popleft() for _ in range(take))
+		return docs
+
+	def batches(self, batch_size=None):
+		"""Iterate over the remaining documents one batch at a time.
+
+		Args:
+			batch_size (int): If given, each batch holds ``batch_size`` documents, except the last one,
+				and the server is asked to return as many per batch.
+				Otherwise each batch holds the documents of a batch returned by the server
+
+		Yields:
+			list: The manipulated documents of each batch
+		"""
+		if batch_size is not None:
+			self.cursor.batch_size(batch_size)
+			while True:
+				docs = self.to_list(batch_size)
+				if not docs:
+					return
+				yield docs
+
+		batch = self._batch
+		while batch or self._fill():
+			docs = list(batch)
+			batch.clear()
+			yield docs
+
+	def rewind(self):
+		"""Rewind this cursor to its unevaluated state. See ``pymongo.cursor.Cursor.rewind``"""
+		self._batch.clear()
+		self.cursor.rewind()
+		return self
+
+	def clone(self):
+		"""Get a clone of this cursor. See ``pymongo.cursor.Cursor.clone``"""
+		return self._wrap(self.cursor.clone())
 
 	def __getitem__(self, index):
 		res = self.cursor.__getitem__(index)
 
 		if isinstance(res, Cursor):
-			return WrappedCursor(res, self.model)
+			return self._wrap(res)
 
-		return self.model.apply_outgoing_manipulators(res)
+		if self.raw:
+			return LazyBSONDocument(res.raw, self.cursor.collection.codec_options) if self.lazy else res
+		if self.lazy:
+			return LazyDocument(res, self.model, self.projection, self._outgoing())
+		return self._outgoing().apply_outgoing(res, self.model)
 
 	def __iter__(self):
 		return self
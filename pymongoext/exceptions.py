@@ -6,3 +6,27 @@ class MultipleDocumentsFound(Exception):
 class NoDocumentFound(Exception):
 	"""Raised by :meth:`pymongoext.model.Model.get`
 	when no documents matching the search criteria are found"""
+
+
+class DocumentManipulationError(Exception):
+	"""Raised when a manipulator fails on one of the documents passed to
+	:meth:`pymongoext.model.Model.insert_many` with a ``chunk_size`` or an ``executor``
+
+	Args:
+		index (int): Position of the failing document in the input
+		error (Exception): The error raised by the manipulator
+
+	Attributes:
+		inserted_ids (list): With a ``chunk_size``, the _ids of the documents inserted before the error
+		chunks (list of pymongoext.results.ChunkTiming): With a ``chunk_size``, the timings of the chunks sent
+	"""
+
+	def __init__(self, index, error):
+		super().__init__(index, error)
+		self.index = index
+		self.error = error
+		self.inserted_ids = None
+		self.chunks = None
+
+	def __str__(self):
+		return 'Failed to manipulate document at index {}: {!r}'.format(self.index, self.error)
@@ -0,0 +1,92 @@
+import csv
+from datetime import datetime
+from bson import json_util
+from pymongoext.columns import ColumnBuilder
+
+__all__ = [
+    'write_ndjson',
+    'write_csv',
+    'column_chunks'
+]
+
+
+def _ordered(doc, columns):
+    """Reorder a document to follow the columns, keeping any other keys after them"""
+    row = {column.name: doc[column.name] for column in columns if column.name in doc}
+    row.update(doc)
+    return row
+
+
+def write_ndjson(batches, fp, columns=None, restrict=False):
+    """Write batches of documents as newline delimited JSON in MongoDB Extended JSON
+
+    Args:
+        batches (iterable of list of dict): The documents, one batch at a time
+        fp: A text file object
+        columns (list of pymongoext.columns.Column): Fixes the order of the keys of each document
+        restrict (bool): If ``True``, only the columns are written
+
+    Returns:
+        int: The number of documents written
+    """
+    count = 0
+    for docs in batches:
+        if columns is not None:
+            if restrict:
+                docs = [{column.name: column.get(doc) for column in columns} for doc in docs]
+            else:
+                docs = [_ordered(doc, columns) for doc in docs]
+        fp.write(''.join(json_util.dumps(doc) + '\n' for doc in docs))
+        count += len(docs)
+    return count
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json_util.dumps(value)
+    return value
+
+
+def write_csv(batches, fp, columns):
+    """Write batches of documents as CSV, with a header row of column names
+
+    Missing values are written as empty strings, datetimes in ISO 8601 format
+    and embedded documents and arrays in MongoDB Extended JSON.
+
+    Args:
+        batches (iterable of list of dict): The documents, one batch at a time
+        fp: A text file object opened with ``newline=''``
+        columns (list of pymongoext.columns.Column): The columns to write
+
+    Returns:
+        int: The number of documents written
+    """
+    writer = csv.writer(fp)
+    writer.writerow([column.name for column in columns])
+
+    count = 0
+    for docs in batches:
+        writer.writerows([_csv_value(column.get(doc)) for column in columns] for doc in docs)
+        count += len(docs)
+    return count
+
+
+def column_chunks(batches, columns):
+    """Convert batches of documents to NumPy arrays
+
+    Args:
+        batches (iterable of list of dict): The documents, one batch at a time
+        columns (list of pymongoext.columns.Column): The columns to convert
+
+    Yields:
+        dict of str: numpy.ma.MaskedArray: The columns of each batch.
+        See :class:`pymongoext.columns.ColumnBuilder`
+    """
+    for docs in batches:
+        builder = ColumnBuilder(columns, len(docs))
+        builder.extend(docs)
+        yield builder.finish()
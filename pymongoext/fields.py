@@ -1,6 +1,7 @@
 import inflection
 import copy
-from datetime import datetime
+import functools
+from datetime import datetime, timedelta
 from dateutil import parser
 import bson
 from fastnumbers import fast_float
@@ -50,6 +51,49 @@ def _is_positive_int(x):
     return x >= 0 and x % 1 == 0
 
 
+_IMMUTABLE = (str, bytes, int, float, bool, tuple, frozenset, datetime, bson.ObjectId)
+
+
+def _default_factory(default):
+    """Returns a function that produces the given default value"""
+    if callable(default):
+        return default
+
+    if isinstance(default, _IMMUTABLE):
+        return lambda: default
+
+    return lambda: copy.deepcopy(default)
+
+
+_CAMEL_CASE = {
+    key: inflection.camelize(key, uppercase_first_letter=False) for key in (
+        'enum', 'title', 'description', 'bson_type',
+        'max_length', 'min_length', 'pattern',
+        'maximum', 'minimum', 'exclusive_maximum', 'exclusive_minimum', 'multiple_of',
+        'items', 'max_items', 'min_items', 'unique_items',
+        'properties', 'additional_properties', 'required', 'max_properties', 'min_properties',
+        'one_of', 'all_of', 'any_of', 'not'
+    )
+}
+"""camelCase JsonSchema keywords by attribute name"""
+
+
+def _camelize(key):
+    camel = _CAMEL_CASE.get(key)
+    if camel is None:
+        camel = _CAMEL_CASE[key] = inflection.camelize(key, uppercase_first_letter=False)
+    return camel
+
+
+_schema_generation = 0
+"""Incremented whenever an attribute of a field is set, invalidating the memoized schemas"""
+
+
+def _shallow_copy(value):
+    """Copy a dict without copying its values"""
+    return dict(value) if type(value) is dict else copy.copy(value)
+
+
 class Field:
     """Base class for all fields
 
@@ -74,32 +118,55 @@ class Field:
             **kwargs
         )
 
-    def _bson_type(self):
+    def __setattr__(self, key, value):
+        global _schema_generation
+        super().__setattr__(key, value)
+        # Only fields whose schema has been generated can be part of a memoized schema
+        if '_schema_memo' in self.__dict__:
+            _schema_generation += 1
+
+    def _bson_type(self, required):
         """Defer computation of bson_type as it depends on the required attribute"""
-        if self.__type__ is None or self.__type__ == 'null' or self.required:
+        if self.__type__ is None or self.__type__ == 'null' or required:
             return self.__type__
         return [self.__type__, "null"]
 
-    def _deferred_attributes(self):
+    def _deferred_attributes(self, required):
         """Defer computation of dynamic attributes"""
         return {}
 
+    def _schema(self, required):
+        """Creates the JsonSchema object of this field as if its ``required`` attribute was set to ``required``.
+
+        The result is memoized until an attribute of any field is set.
+        """
+        generation = _schema_generation
+        memo = self.__dict__.get('_schema_memo')
+        if memo is None or memo[0] != generation:
+            memo = (generation, {})
+            object.__setattr__(self, '_schema_memo', memo)
+
+        schema = memo[1].get(required)
+        if schema is None:
+            attributes = dict(
+                **self.attributes,
+                **self._deferred_attributes(required),
+                bson_type=self._bson_type(required)
+            )
+            schema = memo[1][required] = {_camelize(k): v for k, v in attributes.items() if v is not None}
+        return schema
+
     def schema(self):
         """Creates a valid JsonSchema object
 
+        The schema is memoized and shared, it should not be modified.
+        Setting an attribute of any field invalidates it,
+        but changes made inside containers such as ``attributes`` or ``props`` are not detected.
+
         Returns:
             dict
         """
-        attributes = dict(
-            **self.attributes,
-            **self._deferred_attributes(),
-            bson_type=self._bson_type()
-        )
-
-        return {
-            inflection.camelize(k, uppercase_first_letter=False): v
-            for k, v in attributes.items() if v is not None
-        }
+        return self._schema(self.required)
 
     def _parse_non_null_value(self, value):
         return value
@@ -116,6 +183,40 @@ class Field:
 
         return copy.deepcopy(self.default)
 
+    def compile_parser(self):
+        """Compile this field into a function equivalent to :meth:`~parse`.
+
+        The returned function takes the arguments ``(value, with_default)``.
+        Its behaviour is fixed at compile time, so the field should not be modified afterwards.
+
+        Returns:
+            callable
+        """
+        if type(self).parse is not Field.parse:
+            return self.parse
+
+        default = self.default
+        convert = self._parse_non_null_value
+        identity = type(self)._parse_non_null_value is Field._parse_non_null_value
+
+        if default is None:
+            if identity:
+                return lambda value, with_default: value
+
+            def _parse(value, with_default):
+                return value if value is None else convert(value)
+
+            return _parse
+
+        make_default = _default_factory(default)
+
+        def _parse_with_default(value, with_default):
+            if value is not None:
+                return value if identity else convert(value)
+            return make_default() if with_default else value
+
+        return _parse_with_default
+
     def __str__(self):
         return str(self.schema())
 
@@ -128,6 +229,9 @@ class NullField(Field):
         super().__init__()
 
 
+_NULL = NullField()
+
+
 class StringField(Field):
     """String field
 
@@ -245,7 +349,7 @@ class ListField(Field):
             unique_items=unique_items
         )
 
-    def _deferred_attributes(self):
+    def _deferred_attributes(self, required):
         return dict(
             items=None if self.field is None else self.field.schema()
         )
@@ -290,12 +394,12 @@ class DictField(Field):
             min_properties=min_props
         )
 
-    def _deferred_attributes(self):
+    def _deferred_attributes(self, required):
         ap = self.additional_props
         props = self.props
         required_props = self.required_props
 
-        required_props = [] if required_props is None else list(copy.deepcopy(required_props))
+        required_props = [] if required_props is None else list(required_props)
         if props is not None:
             for name, field in props.items():
                 if field.required:
@@ -323,7 +427,7 @@ class DictField(Field):
 
         # _id field defaults to ObjectID
         if is_schema and _ID not in props:
-            props['_id'] = ObjectIDField()
+            props = dict(props, _id=ObjectIDField())
 
         # Parse given keys
         for key, value in data.items():
@@ -351,6 +455,151 @@ class DictField(Field):
 
         return data
 
+    def compile_parser(self, is_schema=False):
+        """Compile this field into a function equivalent to :meth:`~parse`.
+
+        Key sets, defaults and the parsers of the nested fields are computed once.
+        Unlike :meth:`~parse`, the compiled function does not deep copy the input.
+        Only the dicts it modifies are copied, values that need no conversion are shared with the input.
+
+        Args:
+            is_schema (bool): If ``True``, the ``_id`` field defaults to an :class:`~ObjectIDField`
+
+        Returns:
+            callable
+        """
+        if type(self).parse is not DictField.parse:
+            return lambda value, with_defaults: self.parse(value, with_defaults, is_schema=is_schema)
+
+        props = {} if self.props is None else dict(self.props)
+        if is_schema and _ID not in props:
+            props[_ID] = ObjectIDField()
+
+        parsers = {key: field.compile_parser() for key, field in props.items()}
+        defaults = tuple(
+            (key, parsers[key]) for key, field in props.items()
+            if field.default is not None or isinstance(field, DictField) or type(field).parse is not Field.parse
+        )
+
+        ap = self.additional_props
+        drop_additional = not ap
+        parse_additional = ap.compile_parser() if isinstance(ap, Field) else None
+
+        def _parse(value, with_defaults):
+            if value is None:
+                if not with_defaults:
+                    return value
+                data = {}
+            else:
+                data = _shallow_copy(value)
+
+            # Parse given keys
+            additional = []
+            for key, item in data.items():
+                parse = parsers.get(key)
+                if parse is not None:
+                    data[key] = parse(item, with_defaults)
+                else:
+                    additional.append(key)
+
+            # Fill in missing keys
+            if with_defaults:
+                for key, parse in defaults:
+                    if key not in data:
+                        default = parse(None, True)
+                        if default is not None:
+                            data[key] = default
+
+            # Additional props
+            if drop_additional:
+                for key in additional:
+                    del data[key]
+
+            elif parse_additional is not None:
+                for key in additional:
+                    data[key] = parse_additional(data[key], with_defaults)
+
+            return data
+
+        return _parse
+
+    def compile_path_index(self, is_schema=False):
+        """Compile this field into an index resolving dotted paths, such as ``products.0.name``,
+        to the fields they refer to.
+
+        The index is used to parse update documents without expanding the dotted keys.
+        See :meth:`pymongoext.model.Model.parse_update`
+
+        Args:
+            is_schema (bool): If ``True``, the ``_id`` field defaults to an :class:`~ObjectIDField`
+
+        Returns:
+            _PathNode: The root of the index
+        """
+        return _PathNode(self, is_schema)
+
+
+class _PathNode:
+    """A node of the path index compiled by :meth:`DictField.compile_path_index`
+
+    Args:
+        field (Field): The field at this path
+        is_schema (bool): If ``True``, the ``_id`` field defaults to an :class:`~ObjectIDField`
+    """
+
+    __slots__ = ('parse', 'children', 'additional', 'closed', 'item')
+
+    def __init__(self, field, is_schema=False):
+        self.parse = field.compile_parser(is_schema) if is_schema else field.compile_parser()
+        self.children = None
+        self.additional = None
+        self.closed = False
+        self.item = None
+
+        if isinstance(field, DictField):
+            props = {} if field.props is None else dict(field.props)
+            if is_schema and _ID not in props:
+                props[_ID] = ObjectIDField()
+            self.children = {key: _PathNode(f) for key, f in props.items()}
+            ap = field.additional_props
+            self.closed = not ap
+            self.additional = _PathNode(ap) if isinstance(ap, Field) else None
+
+        elif isinstance(field, ListField) and field.field is not None:
+            self.item = _PathNode(field.field)
+
+    def resolve(self, path):
+        """Find the node of a dotted path relative to this node.
+
+        Numeric segments and the positional operators ``$``, ``$[]`` and ``$[identifier]``
+        step into the items of a :class:`~ListField`.
+
+        Returns:
+            _PathNode: The node, :data:`~_CLOSED` if the path is not allowed by the schema
+            or ``None`` if the field at the path is unknown
+        """
+        node = self
+        for segment in path.split('.'):
+            if node.item is not None:
+                node = node.item
+            elif node.children is not None:
+                child = node.children.get(segment)
+                if child is not None:
+                    node = child
+                elif node.closed:
+                    return _CLOSED
+                elif node.additional is not None:
+                    node = node.additional
+                else:
+                    return None
+            else:
+                return None
+        return node
+
+
+_CLOSED = object()
+"""Returned by :meth:`_PathNode.resolve` for paths that are not allowed by the schema"""
+
 
 class MapField(DictField):
     def __init__(self, field, **kwargs):
@@ -376,16 +625,13 @@ class _WithListFieldsInput(Field):
 
         super().__init__(**kwargs)
 
-    def _deferred_attributes(self):
-        fields = list(copy.deepcopy(self._fields))
-        for field in fields:
-            field.required = True
-
-        if self.__add_null__ and not self.required:
-            fields.append(NullField())
+    def _deferred_attributes(self, required):
+        schemas = [field._schema(True) for field in self._fields]
+        if self.__add_null__ and not required:
+            schemas.append(_NULL.schema())
 
         key = inflection.underscore(self.__class__.__name__)
-        return {key: [field.schema() for field in fields]}
+        return {key: schemas}
 
 
 class OneOf(_WithListFieldsInput):
@@ -417,20 +663,64 @@ class Not(Field):
         self._field = field
         super().__init__(**kwargs)
 
-    def _deferred_attributes(self):
-        field = copy.deepcopy(self._field)
-        field.required = not self.required  # Negate field's required state
-        return {'not': field.schema()}
+    def _deferred_attributes(self, required):
+        # Negate field's required state
+        return {'not': self._field._schema(not required)}
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+_fromisoformat = getattr(datetime, 'fromisoformat', None)  # Python 3.7+
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_datetime_string(value, formats):
+    """Parse a datetime string, memoizing recently parsed strings.
+
+    ISO 8601 strings are parsed with ``datetime.fromisoformat``, then each of ``formats`` is tried
+    with ``datetime.strptime`` before falling back to ``dateutil.parser.parse``.
+    """
+    if _fromisoformat is not None:
+        try:
+            return _fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+        except ValueError:
+            pass
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+
+    return parser.parse(value)
 
 
 class DateTimeField(Field):
-    """Datetime field"""
+    """Datetime field
+
+    Strings are parsed as ISO 8601, then with each of ``formats``, then with ``dateutil.parser.parse``.
+    Numbers are interpreted as seconds since the Unix epoch and converted to naive UTC datetimes.
+
+    Args:
+        formats (list of str): ``datetime.strptime`` formats to try on strings that are not ISO 8601. Keyword only
+        *args, **kwargs: any additional arguments are the same as the arguments to the :class:`~Field` class
+    """
     __type__ = 'date'
 
+    def __init__(self, *args, formats=None, **kwargs):
+        self.formats = () if formats is None else tuple(formats)
+        super().__init__(*args, **kwargs)
+
     def _parse_non_null_value(self, value):
         if isinstance(value, datetime):
             return value
 
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return _EPOCH + timedelta(seconds=value)
+
+        if isinstance(value, str):
+            return _parse_datetime_string(value, self.formats)
+
         return parser.parse(value)
 
 
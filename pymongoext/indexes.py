@@ -0,0 +1,170 @@
+import logging
+from collections import namedtuple
+from collections.abc import Mapping
+
+__all__ = [
+    'IndexPlan',
+    'index_plan'
+]
+
+_logger = logging.getLogger(__name__)
+
+_ID_INDEX = '_id_'
+
+_IGNORED_OPTIONS = frozenset(('key', 'name', 'background', 'v', 'ns'))
+"""Index options that do not change the index"""
+
+_SERVER_DEFAULTS = frozenset(('textIndexVersion', '2dsphereIndexVersion', 'default_language', 'language_override'))
+"""Index options the server fills in, only compared when declared"""
+
+
+def _canonical(value):
+    """Convert a value to a hashable form where equal documents compare equal regardless of key order"""
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+_TEXT_KEY = (('_fts', 'text'), ('_ftsx', 1))
+"""The key pattern the server stores for the fields of a text index"""
+
+
+def _key(items):
+    """Canonical key pattern. Text fields are collapsed as the server stores them"""
+    pattern = []
+    for field, direction in items:
+        if direction == 'text' or field == '_ftsx':
+            if _TEXT_KEY[0] not in pattern:
+                pattern.extend(_TEXT_KEY)
+            continue
+        pattern.append((field, _canonical(direction)))
+    return tuple(pattern)
+
+
+def _spec(document, declared=None):
+    """Canonical key pattern and options of an index document.
+
+    Args:
+        document (dict): The index, as in ``IndexModel.document`` or ``Collection.index_information()``
+        declared (dict): The declared index this document is compared with.
+            Options filled in by the server are dropped unless the declared index has them
+    """
+    items = list(document['key'].items() if isinstance(document['key'], Mapping) else document['key'])
+    options = {}
+
+    text_fields = [field for field, direction in items if direction == 'text']
+    if text_fields and 'weights' not in document:
+        options['weights'] = {field: 1 for field in text_fields}
+
+    for option, value in document.items():
+        if option in _IGNORED_OPTIONS or value is False:
+            continue
+        if declared is not None and option not in declared:
+            if option in _SERVER_DEFAULTS:
+                continue
+        if option == 'collation' and declared is not None and isinstance(declared.get(option), Mapping):
+            value = {k: v for k, v in value.items() if k in declared[option]}
+        options[option] = value
+    return _key(items), _canonical(options)
+
+
+class IndexPlan(namedtuple('IndexPlan', ['create', 'rebuild', 'drop', 'unchanged'])):
+    """The changes required to bring the indexes of a collection in line with the declared indexes.
+
+    Attributes:
+        create (list of pymongo.IndexModel): Declared indexes that do not exist
+        rebuild (list of pymongo.IndexModel): Declared indexes whose key pattern or options changed.
+            If rebuilt, the existing index with the same name is dropped before the index is created again
+        drop (list of str): Names of existing indexes that are not declared
+        unchanged (list of str): Names of existing indexes that match a declared index
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_empty(self):
+        """bool: ``True`` if the indexes are up to date"""
+        return not (self.create or self.rebuild or self.drop)
+
+    def apply(self, collection, rebuild=False):
+        """Run the planned commands on a collection
+
+        Indexes are dropped before indexes are created, so that a changed index can reuse its name.
+        Rebuilding an index drops it, leaving the collection without it, or without its unique constraint,
+        until it is built again. Changed indexes are therefore only logged unless ``rebuild`` is ``True``.
+        Each changed index is then dropped right before it is created again, to keep the window without it short.
+
+        Args:
+            collection (pymongo.collection.Collection): The collection to update
+            rebuild (bool): Rebuild the indexes whose definition changed
+        """
+        name = collection.name
+        for index in self.drop:
+            _logger.info('Dropping index %s of %s', index, name)
+            collection.drop_index(index)
+
+        if self.rebuild and not rebuild:
+            _logger.warning(
+                'Indexes %s of %s changed and are not rebuilt. Rebuild them with _update(rebuild=True)',
+                ', '.join(m.document['name'] for m in self.rebuild), name
+            )
+
+        for model in self.rebuild if rebuild else ():
+            index = model.document['name']
+            _logger.warning('Rebuilding index %s of %s as its definition changed', index, name)
+            collection.drop_index(index)
+            collection.create_indexes([model])
+
+        if self.create:
+            _logger.info('Creating indexes %s of %s', ', '.join(m.document['name'] for m in self.create), name)
+            collection.create_indexes(self.create)
+
+
+def index_plan(declared, existing):
+    """Compare the declared indexes to the existing indexes
+
+    Indexes are matched by name, then by key pattern and options.
+    An existing index with the same key pattern and options as a declared index is kept even if its name differs,
+    so renaming an index never rebuilds it.
+
+    Args:
+        declared (list of pymongo.IndexModel): The indexes the collection should have
+        existing (dict): The indexes the collection has, as returned by ``Collection.index_information()``
+
+    Returns:
+        IndexPlan
+    """
+    existing = {name: info for name, info in existing.items() if name != _ID_INDEX}
+    rebuild, unchanged, missing = [], [], []
+
+    for model in declared:
+        document = model.document
+        name = document['name']
+        if name not in existing:
+            missing.append(model)
+        elif _spec(existing[name], document) == _spec(document):
+            unchanged.append(name)
+        else:
+            rebuild.append(model)
+
+    matched = set(unchanged) | {model.document['name'] for model in rebuild}
+    create = []
+    for model in missing:
+        document = model.document
+        spec = _spec(document)
+        renamed = next(
+            (n for n, info in existing.items() if n not in matched and _spec(info, document) == spec),
+            None
+        )
+        if renamed is None:
+            create.append(model)
+        else:
+            matched.add(renamed)
+            unchanged.append(renamed)
+
+    drop = [name for name in existing if name not in matched]
+    return IndexPlan(create, rebuild, drop, unchanged)
@@ -0,0 +1,248 @@
+import asyncio
+from pymongoext.binder import _chunks
+from pymongoext.exceptions import NoDocumentFound
+
+__all__ = [
+    'DEFAULT_MAX_BATCH_SIZE',
+    'PendingDocument',
+    'Loader',
+    'AsyncLoader'
+]
+
+DEFAULT_MAX_BATCH_SIZE = 1000
+"""Default maximum number of ids sent in a single ``$in`` query"""
+
+
+def _load_cached(model, keys):
+    """Split keys into the documents found in the model cache and the keys that must be queried
+
+    Returns:
+        tuple: ``(found, missing, generation)`` where found is a dict of documents by ``_id``,
+        missing a list of keys and generation the generation of the cache to pass to :func:`_index_documents`
+    """
+    cache = model.cache()
+    if cache is None:
+        return {}, keys, None
+
+    generation = cache.generation
+    found, missing = {}, []
+    for key in keys:
+        doc = cache.get(key)
+        if doc is None:
+            missing.append(key)
+        else:
+            found[key] = doc
+    return found, missing, generation
+
+
+def _index_documents(model, docs, generation):
+    """Apply the outgoing manipulators to raw documents and index them by their raw ``_id``.
+    The documents are stored in the model cache unless it was invalidated since ``generation``
+
+    Returns:
+        dict: The manipulated documents by ``_id``
+    """
+    keys = [doc['_id'] for doc in docs]
+    docs = model.apply_outgoing_manipulators_batch(docs)
+
+    cache = model.cache()
+    if cache is not None:
+        for key, doc in zip(keys, docs):
+            cache.set(key, doc, generation)
+    return dict(zip(keys, docs))
+
+
+def _query(keys):
+    return {'_id': {'$in': keys}}
+
+
+class PendingDocument:
+    """The result of a :meth:`Loader.load` call, available once the loader has dispatched"""
+
+    __slots__ = ('loader', 'key', 'done', '_doc')
+
+    def __init__(self, loader, key):
+        self.loader = loader
+        self.key = key
+        self.done = False
+        self._doc = None
+
+    def _resolve(self, doc):
+        self._doc = doc
+        self.done = True
+
+    def result(self):
+        """Get the loaded document, dispatching the pending lookups of the loader first if required
+
+        Raises:
+            pymongoext.exceptions.NoDocumentFound: No document has this ``_id``
+        """
+        if not self.done:
+            self.loader.dispatch()
+        if self._doc is None:
+            raise NoDocumentFound()
+        return self._doc
+
+
+class Loader:
+    """Batches lookups by ``_id`` into ``{"_id": {"$in": [...]}}`` queries.
+
+    :meth:`~load` queues a lookup and returns a :class:`PendingDocument`.
+    Queued lookups are sent together when a result is requested, when :meth:`~dispatch` is called
+    or when the loader is used as a context manager and the block exits.
+    Documents are passed through the outgoing manipulators once and memoized by the loader,
+    so a loader should be scoped to a single unit of work such as a request. It is not thread safe.
+
+    Examples:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            with User.loader() as loader:
+                pending = [loader.load(post.author_id) for post in posts]
+            authors = [p.result() for p in pending]
+
+    Args:
+        model (pymongoext.model.Model): The model to load
+        max_batch_size (int): Maximum number of ids sent in a single query
+    """
+
+    def __init__(self, model, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self._documents = {}
+        self._queue = []
+
+    def load(self, id):
+        """Queue the lookup of a document by ``_id``
+
+        Returns:
+            PendingDocument
+        """
+        pending = self._documents.get(id)
+        if pending is None:
+            pending = self._documents[id] = PendingDocument(self, id)
+            self._queue.append(id)
+        return pending
+
+    def load_many(self, ids):
+        """Load several documents, returned in the order of ``ids``
+
+        Raises:
+            pymongoext.exceptions.NoDocumentFound: Any of the ids has no document
+        """
+        pending = [self.load(id) for id in ids]
+        return [p.result() for p in pending]
+
+    def get(self, id):
+        """Load a single document. See :meth:`pymongoext.model.Model.get`"""
+        return self.load(id).result()
+
+    def dispatch(self):
+        """Send the queued lookups"""
+        keys, self._queue = self._queue, []
+        found, missing, generation = _load_cached(self.model, keys)
+
+        for chunk in _chunks(missing, self.max_batch_size):
+            docs = list(self.model.c().find(_query(chunk)))
+            found.update(_index_documents(self.model, docs, generation))
+
+        for key in keys:
+            self._documents[key]._resolve(found.get(key))
+
+    def clear(self):
+        """Forget the memoized documents"""
+        self._documents = {k: v for k, v in self._documents.items() if not v.done}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.dispatch()
+
+
+class AsyncLoader:
+    """The asyncio variant of :class:`Loader` for :class:`pymongoext.aio.AsyncModel`.
+
+    Lookups made within the same iteration of the event loop are sent together.
+
+    Examples:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            loader = User.loader()
+            authors = await asyncio.gather(*[loader.load(post.author_id) for post in posts])
+
+    Args:
+        model (pymongoext.aio.AsyncModel): The model to load
+        max_batch_size (int): Maximum number of ids sent in a single query
+    """
+
+    def __init__(self, model, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self._documents = {}
+        self._queue = []
+
+    def load(self, id):
+        """Queue the lookup of a document by ``_id``
+
+        Returns:
+            asyncio.Future: Resolves to the document or raises
+            :class:`pymongoext.exceptions.NoDocumentFound`
+        """
+        future = self._documents.get(id)
+        if future is None:
+            loop = asyncio.get_event_loop()
+            future = self._documents[id] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._schedule_dispatch)
+            self._queue.append(id)
+        return future
+
+    async def load_many(self, ids):
+        """Load several documents, returned in the order of ``ids``"""
+        return await asyncio.gather(*[self.load(id) for id in ids])
+
+    async def get(self, id):
+        """Load a single document. See :meth:`pymongoext.model.Model.get`"""
+        return await self.load(id)
+
+    def _schedule_dispatch(self):
+        keys, self._queue = self._queue, []
+        asyncio.ensure_future(self._dispatch(keys))
+
+    async def _fetch(self, collection, chunk, generation):
+        docs = await collection.find(_query(chunk)).to_list(None)
+        return _index_documents(self.model, docs, generation)
+
+    async def _dispatch(self, keys):
+        futures = [self._documents[key] for key in keys]
+        try:
+            found, missing, generation = _load_cached(self.model, keys)
+            if missing:
+                collection = await self.model._updated_collection()
+                chunks = _chunks(missing, self.max_batch_size)
+                fetches = [self._fetch(collection, chunk, generation) for chunk in chunks]
+                for docs in await asyncio.gather(*fetches):
+                    found.update(docs)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in zip(keys, futures):
+            if future.done():
+                continue
+            doc = found.get(key)
+            if doc is None:
+                future.set_exception(NoDocumentFound())
+            else:
+                future.set_result(doc)
+
+    def clear(self):
+        """Forget the memoized documents"""
+        self._documents = {k: v for k, v in self._documents.items() if not v.done()}
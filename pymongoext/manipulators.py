@@ -27,6 +27,13 @@ class Manipulator:
 	Manipulators with a lower priority will be applied first	
 	"""
 
+	fields = None
+	"""Names of the top level fields :meth:`~transform_outgoing` needs.
+
+	When documents are retrieved with a projection that excludes any of these fields,
+	the outgoing transformation is skipped. If ``None``, it is always applied.
+	"""
+
 	def transform_incoming(self, doc, model, action):
 		"""Manipulate an incoming document.
 
@@ -46,6 +53,22 @@ class Manipulator:
 		"""
 		return doc
 
+	def transform_outgoing_batch(self, docs, model):
+		"""Manipulate a batch of outgoing documents.
+
+		:class:`pymongoext.cursor.WrappedCursor` calls this once for each batch returned by the server.
+		The default implementation calls :meth:`~transform_outgoing` on each document.
+		Override it to process the whole batch at once.
+
+		Args:
+			docs (list of dict): the SON objects being retrieved from the database
+			model (Type[pymongoext.model.Model]): the model associated with these documents
+
+		Returns:
+			list of dict: the transformed documents, in the same order
+		"""
+		return [self.transform_outgoing(doc, model) for doc in docs]
+
 
 class MunchManipulator(Manipulator):
 	"""Transforms documents to Munch objects.
@@ -61,11 +84,15 @@ class MunchManipulator(Manipulator):
 	def transform_outgoing(self, doc, model):
 		return Munch(doc)
 
+	def transform_outgoing_batch(self, docs, model):
+		return [Munch(doc) for doc in docs]
+
 
 class IdWithoutUnderscoreManipulator(Manipulator):
 	"""A document manipulator that manages a virtual id field."""
 
 	priority = 0
+	fields = ('_id',)
 
 	def transform_incoming(self, doc, model, action):
 		"""Remove id field if given and set _id to that value if missing"""
@@ -77,10 +104,17 @@ class IdWithoutUnderscoreManipulator(Manipulator):
 
 	def transform_outgoing(self, doc, model):
 		"""Add an id field if it is missing."""
-		if "id" not in doc:
+		if "id" not in doc and "_id" in doc:
 			doc["id"] = doc["_id"]
 		return doc
 
+	def transform_outgoing_batch(self, docs, model):
+		"""Add an id field to each document where it is missing."""
+		for doc in docs:
+			if "id" not in doc and "_id" in doc:
+				doc["id"] = doc["_id"]
+		return docs
+
 
 class ParseInputsManipulator(Manipulator):
 	"""Parses incoming documents to ensure data is in the valid format"""
@@ -90,12 +124,7 @@ class ParseInputsManipulator(Manipulator):
 		if action in [IncomingAction.CREATE, IncomingAction.REPLACE]:
 			return model.parse(doc, with_defaults=True)
 
-		if action == IncomingAction.UPDATE and '$set' in doc:
-			data = doc['$set']
-			# todo: Handle array elements and embedded documents. eg user.name, products.0.name
-			#   1. Expand the data to eliminate .s (dots)
-			#   2. Parse the data
-			#   3. Deflate the data to bring back the dots
-			doc['$set'] = model.parse(data, with_defaults=False)
+		if action == IncomingAction.UPDATE:
+			return model.parse_update(doc)
 
 		return doc
@@ -1,21 +1,279 @@
-from pymongo import IndexModel, DESCENDING, ASCENDING
+import logging
+import threading
+import weakref
+from collections import namedtuple
+from pymongo import MongoClient, IndexModel, DESCENDING, ASCENDING
 from pymongo.errors import OperationFailure
 from pymongo.collection import Collection
+from bson.raw_bson import RawBSONDocument
 import inflection
-from pymongoext.binder import _BindCollectionMethods
+from pymongoext import connection
+from pymongoext.binder import _BindCollectionMethods, _chunks
+from pymongoext.cache import DocumentCache, CacheInvalidator, document_key
 from pymongoext.exceptions import NoDocumentFound, MultipleDocumentsFound
-from pymongoext.fields import DictField
+from pymongoext.fields import DictField, _CLOSED, _shallow_copy
+from pymongoext.indexes import index_plan
+from pymongoext.loader import Loader, DEFAULT_MAX_BATCH_SIZE
+from pymongoext import columns as _columns, export as _export
 from pymongoext.manipulators import *
 
 
 _BM = Manipulator()
 
+_logger = logging.getLogger(__name__)
+
+_CLASS_CACHE = weakref.WeakKeyDictionary()
+"""Per model values derived from the class definition. See :meth:`Model._cached`"""
+
+_RUNTIME_STATE = weakref.WeakKeyDictionary()
+"""Per model runtime state such as database handles and the document cache. See :meth:`Model._runtime`"""
+
+_RUNTIME_LOCK = threading.RLock()
+
 
 def _manipulator_method_overwritten(instance, method):
     """Test if this method has been overridden."""
     return getattr(instance, method).__func__ != getattr(_BM, method).__func__
 
 
+def _projection_key(projection):
+    """Returns a hashable key identifying which fields a projection returns,
+    or ``None`` if every field may be returned or the projection is not understood.
+    """
+    if not projection:
+        return None
+
+    if isinstance(projection, dict):
+        try:
+            return 'dict', tuple(sorted((k, 'op' if isinstance(v, dict) else bool(v)) for k, v in projection.items()))
+        except TypeError:
+            return None
+
+    try:
+        return 'list', tuple(sorted(projection))
+    except TypeError:
+        return None
+
+
+def _field_present(field, kind, items, values, inclusion):
+    """Checks if a top level field may be present in documents returned with a projection
+
+    Args:
+        field (str): The top level field name
+        kind (str), items (tuple): The parts of a key returned by :func:`~_projection_key`
+        values (dict): ``items`` as a dict, for dict projections
+        inclusion (bool): ``True`` if a dict projection includes fields other than ``_id``
+    """
+    prefix = field + '.'
+
+    if kind == 'list':
+        return field == '_id' or any(name == field or name.startswith(prefix) for name in items)
+
+    if field == '_id':
+        return values.get('_id', True) is not False
+
+    if inclusion:
+        return any((k == field or k.startswith(prefix)) and v is not False for k, v in items)
+
+    return values.get(field, True) is not False
+
+
+def _presence(declared, projection):
+    """Checks which manipulators declaring fields get their fields with a projection
+
+    Args:
+        declared (tuple of tuple): The fields of each manipulator declaring :attr:`Manipulator.fields`
+        projection (dict|list): The projection of the query
+
+    Returns:
+        tuple of bool: Whether the fields of each manipulator are present, ``None`` if all are
+    """
+    key = _projection_key(projection)
+    if key is None:
+        return None
+
+    kind, items = key
+    values = dict(items) if kind == 'dict' else None
+    inclusion = kind == 'dict' and any(v is True for k, v in items if k != '_id')
+    present = tuple(
+        all(_field_present(f, kind, items, values, inclusion) for f in fields) for fields in declared
+    )
+    return None if all(present) else present
+
+
+def _declared_fields(model):
+    """Returns the fields of each manipulator of a model that declares :attr:`Manipulator.fields`"""
+    return tuple(m.fields for m in model.manipulators() if m.fields is not None)
+
+
+def _outgoing(manipulator):
+    """Returns the single document outgoing transformation of a manipulator"""
+    if _manipulator_method_overwritten(manipulator, 'transform_outgoing'):
+        return manipulator.transform_outgoing
+    return lambda doc, model: manipulator.transform_outgoing_batch([doc], model)[0]
+
+
+class _Pipelines(namedtuple('_Pipelines', ['incoming', 'outgoing', 'outgoing_batch'])):
+    """The manipulator pipelines of a model. See :meth:`Model._pipelines`"""
+
+    __slots__ = ()
+
+    def apply_outgoing(self, doc, model):
+        """Apply the outgoing pipeline to a document"""
+        if doc is not None:
+            for transform in self.outgoing:
+                doc = transform(doc, model)
+        return doc
+
+    def apply_outgoing_batch(self, docs, model):
+        """Apply the batch outgoing pipeline to a list of documents"""
+        for transform in self.outgoing_batch:
+            docs = transform(docs, model)
+        return docs
+
+
+def _build_pipelines(model, present):
+    """Build the pipelines of a model, leaving out the manipulators whose fields are not ``present``"""
+    mans = model.manipulators()
+    included = iter(present or ())
+    outgoing = [
+        m for m in mans
+        if (m.fields is None or present is None or next(included))
+        and (_manipulator_method_overwritten(m, 'transform_outgoing')
+             or _manipulator_method_overwritten(m, 'transform_outgoing_batch'))
+    ]
+    return _Pipelines(
+        tuple(m.transform_incoming for m in mans if _manipulator_method_overwritten(m, 'transform_incoming')),
+        tuple(_outgoing(m) for m in outgoing),
+        tuple(m.transform_outgoing_batch for m in outgoing)
+    )
+
+
+def _parse_update_values(index, fields):
+    """Parse the values of an update operator, such as ``$set``, through the fields their paths resolve to"""
+    parsed = {}
+    for path, value in fields.items():
+        node = index.resolve(path)
+        if node is not _CLOSED:
+            parsed[path] = value if node is None else node.parse(value, False)
+    return parsed
+
+
+def _parse_update_items(index, fields):
+    """Parse the values of an array update operator, such as ``$push``, through the item field of each array"""
+    parsed = {}
+    for path, value in fields.items():
+        node = index.resolve(path)
+        if node is _CLOSED:
+            continue
+
+        item = None if node is None else node.item
+        if item is None:
+            parsed[path] = value
+        elif isinstance(value, dict) and '$each' in value:
+            parsed[path] = dict(value, **{'$each': [item.parse(v, False) for v in value['$each']]})
+        else:
+            parsed[path] = item.parse(value, False)
+    return parsed
+
+
+_UPDATE_PARSERS = {
+    '$set': _parse_update_values,
+    '$setOnInsert': _parse_update_values,
+    '$inc': _parse_update_values,
+    '$push': _parse_update_items,
+    '$addToSet': _parse_update_items
+}
+"""Parsers of the update operators handled by :meth:`Model.parse_update`"""
+
+
+def _client_key(client):
+    """Identify the servers a client connects to without selecting a server.
+
+    Pymongo clients are identified by their seed addresses, which survive garbage collection and
+    :func:`pymongoext.connection.reset`. ``MongoClient.__eq__`` is not used as it waits for server selection.
+    Other clients, such as mongomock's, are identified by their ``id``.
+    """
+    if not isinstance(client, MongoClient):
+        # Motor clients wrap a pymongo client
+        client = getattr(client, 'delegate', client)
+    if not isinstance(client, MongoClient):
+        return id(client)
+    settings = client._topology_settings
+    return settings.replica_set_name, frozenset(settings.seeds)
+
+
+_UNORDERED_KEYWORDS = ('required', 'enum')
+"""JsonSchema keywords whose list values are sets"""
+
+
+def _canonical_schema(value):
+    """Convert a JsonSchema document to a form where equivalent documents compare equal.
+
+    Keys are sorted, as are the ``required`` and ``enum`` lists.
+    """
+    if isinstance(value, dict):
+        items = []
+        for key, item in value.items():
+            item = _canonical_schema(item)
+            if key in _UNORDERED_KEYWORDS and isinstance(item, tuple):
+                item = tuple(sorted(item, key=repr))
+            items.append((key, item))
+        return tuple(sorted(items))
+    if isinstance(value, list):
+        return tuple(_canonical_schema(v) for v in value)
+    return value
+
+
+class _SyncRegistry:
+    """Thread safe registry of the ``(database, collection)`` pairs whose meta is up to date.
+
+    Each key has its own lock so that concurrent first requests run a single update.
+    """
+
+    def __init__(self):
+        self._synced = set()
+        self._locks = {}
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._synced
+
+    def add(self, key):
+        self._synced.add(key)
+
+    def discard(self, key):
+        self._synced.discard(key)
+
+    def lock(self, key):
+        """Get the lock guarding updates of the given key"""
+        try:
+            return self._locks[key]
+        except KeyError:
+            with self._lock:
+                return self._locks.setdefault(key, threading.Lock())
+
+    def start_thread(self, key, target):
+        """Start a daemon thread running ``target`` unless one is already running for the given key
+
+        Returns:
+            threading.Thread: The thread running for the key or ``None`` if the key is up to date
+        """
+        with self._lock:
+            if key in self._synced:
+                return None
+
+            thread = self._threads.get(key)
+            if thread is not None and thread.is_alive():
+                return thread
+
+            thread = threading.Thread(target=target, name='pymongoext-update-{}.{}'.format(*key), daemon=True)
+            self._threads[key] = thread
+            thread.start()
+            return thread
+
+
 class Model(metaclass=_BindCollectionMethods):
     """The base class used for defining the structure and properties of collections of documents stored in MongoDB.
     You should not use the :class:`Model` class directly.
@@ -105,6 +363,18 @@ class Model(metaclass=_BindCollectionMethods):
     you can set ``__auto_update__`` to False.
     
     But then remember to call :meth:`~._update` yourself to update the schema.
+    
+    Set ``__auto_update__`` to ``'background'`` to run the update in a background thread
+    instead of blocking the first operation on the collection.
+    Call :meth:`~._update_in_background` at startup to start it before the first request.
+    """
+
+    __connection_alias__ = None
+    """
+    Alias of a connection registered with :func:`pymongoext.connection.register_connection`.
+    
+    If set, the default implementation of :meth:`~db` returns the database of that connection,
+    whose client is shared by all models using the same alias.
     """
 
     __indexes__ = []
@@ -124,9 +394,30 @@ class Model(metaclass=_BindCollectionMethods):
     methods of pymongo Collection for more info.
     """
 
+    __rebuild_indexes__ = False
+    """
+    Indexes whose key pattern or options changed are rebuilt by :meth:`~_update` only if this is ``True``.
+    
+    Rebuilding drops the index first, so queries run without it and a unique constraint is not enforced
+    until it is built again. By default, the indexes to rebuild are logged and left unchanged.
+    See :meth:`~index_plan`.
+    """
+
     __schema__ = None
     """:class:`pymongoext.fields.DictField`: Specifies model schema"""
 
+    __cache__ = None
+    """
+    Enables an in-process cache of documents retrieved by ``_id`` through :meth:`~get` and ``find_one``.
+    
+    Set to ``True`` or to a dict of keyword arguments for :class:`pymongoext.cache.DocumentCache`,
+    e.g. ``dict(maxsize=10000, ttl=60)``. Documents are cached after the outgoing manipulators are applied.
+    
+    Writes through the wrapped ``insert_*``, ``update_*``, ``replace_one``, ``delete_*``, ``bulk_write``
+    and ``find_one_and_*`` methods invalidate the affected documents.
+    Writes by other processes are not seen until the documents expire.
+    """
+
     @classmethod
     def exists(cls, filter=None, *args, **kwargs):
         """Check if a document exists in the database
@@ -147,8 +438,15 @@ class Model(metaclass=_BindCollectionMethods):
 
           **kwargs (optional): any additional keyword arguments
             are the same as the arguments to :meth:`find`.
+            Unless a ``projection`` is given, only the ``_id`` field is retrieved.
+            A ``hint`` keyword argument is applied to the cursor with ``Cursor.hint``.
+
+        The check is a single round trip that retrieves at most one document and closes the cursor.
         """
-        return cls._limited_cursor(filter, 1, *args, **kwargs).count() > 0
+        if not args:
+            kwargs.setdefault('projection', {'_id': True})
+        cursor = cls._limited_cursor(filter, 1, *args, **kwargs)
+        return next(cursor, None) is not None
 
     @classmethod
     def get(cls, filter=None, *args, **kwargs):
@@ -171,20 +469,150 @@ class Model(metaclass=_BindCollectionMethods):
 
           **kwargs (optional): any additional keyword arguments
             are the same as the arguments to :meth:`find`.
+            A ``hint`` keyword argument is applied to the cursor with ``Cursor.hint``.
+
+        At most two documents are retrieved in a single round trip, after which the cursor is closed.
+        If :attr:`~__cache__` is enabled, documents requested by ``_id`` alone are served from the cache.
         """
-        cursor = cls._limited_cursor(filter, 2, *args, **kwargs)
-        count = cursor.count()
-        if count < 1:
+        cache = cls.cache()
+        key = None if cache is None or args or kwargs else document_key(filter)
+        if key is not None:
+            generation = cache.generation
+            doc = cache.get(key)
+            if doc is not None:
+                return doc
+
+        docs = list(cls._limited_cursor(filter, 2, *args, **kwargs))
+        if len(docs) < 1:
             raise NoDocumentFound()
-        if count > 1:
+        if len(docs) > 1:
             raise MultipleDocumentsFound()
-        return cls.apply_outgoing_manipulators(cursor.next())
+
+        doc = cls.apply_outgoing_manipulators(docs[0], kwargs.get('projection', args[0] if args else None))
+        if key is not None:
+            cache.set(key, doc, generation)
+        return doc
+
+    @classmethod
+    def loader(cls, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        """Create a loader that batches :meth:`~get` lookups by ``_id`` into ``$in`` queries
+
+        Args:
+            max_batch_size (int): Maximum number of ids sent in a single query
+
+        Returns:
+            pymongoext.loader.Loader
+        """
+        return Loader(cls, max_batch_size)
+
+    @classmethod
+    def _export_batches(cls, filter, fields, batch_size, kwargs):
+        """Helper method returning the columns of an export and the batches of documents to export"""
+        columns = None
+        if fields is not None or isinstance(cls.__schema__, DictField) and cls.__schema__.props:
+            columns = _columns.schema_columns(cls.__schema__, fields)
+        if fields is not None:
+            kwargs.setdefault('projection', _columns.projection(columns))
+        return columns, cls.find(filter, **kwargs).batches(batch_size)
+
+    @classmethod
+    def export(cls, fp, format='ndjson', filter=None, fields=None, batch_size=1000, **kwargs):
+        """Stream the matching documents to a file, one batch at a time.
+
+        Columns follow the order of ``fields`` or, by default, ``_id`` followed by the properties of :attr:`~__schema__`.
+        Only one batch of documents is held in memory at a time.
+
+        Args:
+            fp: A text file object. Open it with ``newline=''`` for CSV
+            format (str): ``ndjson`` for newline delimited MongoDB Extended JSON or ``csv``
+            filter (dict): The query filter
+            fields (list of str): The fields to export, dotted paths are allowed.
+                NDJSON exports all fields if not specified
+            batch_size (int): The number of documents per batch
+            **kwargs: any additional keyword arguments are the same as the arguments to :meth:`~find`
+
+        Returns:
+            int: The number of documents exported
+        """
+        if format == 'ndjson':
+            columns, batches = cls._export_batches(filter, fields, batch_size, kwargs)
+            return _export.write_ndjson(batches, fp, columns, restrict=fields is not None)
+
+        if format == 'csv':
+            columns, batches = cls._export_batches(filter, fields, batch_size, kwargs)
+            if columns is None:
+                raise ValueError('fields must be specified for models without schema properties')
+            return _export.write_csv(batches, fp, columns)
+
+        raise ValueError('Unsupported export format {}'.format(format))
+
+    @classmethod
+    def export_columns(cls, filter=None, fields=None, batch_size=1000, **kwargs):
+        """Stream the matching documents as NumPy arrays, one batch at a time. Requires numpy.
+
+        The dtype of each column is derived from its field in :attr:`~__schema__`.
+        See :class:`pymongoext.columns.ColumnBuilder`
+
+        Args:
+            filter (dict): The query filter
+            fields (list of str): The fields to export, defaults to ``_id`` followed by the properties of :attr:`~__schema__`
+            batch_size (int): The number of documents per batch
+            **kwargs: any additional keyword arguments are the same as the arguments to :meth:`~find`
+
+        Yields:
+            dict of str: numpy.ma.MaskedArray: The columns of each batch
+        """
+        columns, batches = cls._export_batches(filter, fields, batch_size, kwargs)
+        if columns is None:
+            raise ValueError('fields must be specified for models without schema properties')
+        return _export.column_chunks(batches, columns)
+
+    @classmethod
+    def find_columns(cls, filter=None, fields=None, batch_size=1000, **kwargs):
+        """Query the collection into typed NumPy arrays, one per field. Requires numpy.
+
+        The dtype of each column is derived from its field in :attr:`~__schema__`:
+        ``int64`` for :class:`~pymongoext.fields.IntField`, ``float64`` for other number fields,
+        ``datetime64[ms]`` for :class:`~pymongoext.fields.DateTimeField`, ``bool`` for
+        :class:`~pymongoext.fields.BooleanField`, ``S12`` for :class:`~pymongoext.fields.ObjectIDField`
+        and ``object`` otherwise. Missing and ``null`` values are masked.
+
+        Values are read as stored: the outgoing manipulators are not applied.
+        Documents are consumed a batch at a time into preallocated arrays, no document is kept.
+
+        Examples:
+
+            .. highlight:: python
+            .. code-block:: python
+
+                columns = Product.find_columns({'in_stock': True}, fields=['price', 'created_at'])
+                columns['price'].mean()
+
+        Args:
+            filter (dict): The query filter
+            fields (list of str): The fields to read, dotted paths are allowed.
+                Defaults to ``_id`` followed by the properties of :attr:`~__schema__`
+            batch_size (int): The number of documents per batch
+            **kwargs: any additional keyword arguments are the same as the arguments to ``find``
+
+        Returns:
+            dict of str: numpy.ma.MaskedArray: The values of each field by name
+        """
+        columns = _columns.schema_columns(cls.__schema__, fields)
+        kwargs.setdefault('projection', _columns.projection(columns))
+        builder = _columns.ColumnBuilder(columns, kwargs.get('limit') or batch_size)
+
+        cursor = cls.c().find(filter, **kwargs).batch_size(batch_size)
+        for docs in _chunks(cursor, batch_size):
+            builder.extend(docs)
+        return builder.finish()
 
     @classmethod
     def db(cls):
         """Get the mongo database instance associated with this collection
 
-        All concrete classes must implement this method. A sample implementation is shown below
+        All concrete classes must either set :attr:`~__connection_alias__` or implement this method.
+        A sample implementation is shown below
 
 
         .. highlight:: python
@@ -198,11 +626,48 @@ class Model(metaclass=_BindCollectionMethods):
                 def db(cls):
                     return MongoClient()['my_database_name']
 
+        The database and collection are resolved once and cached by :meth:`~c`,
+        so creating a client in this method does not create a client per operation.
+        Prefer sharing a client across models, see :func:`pymongoext.connection.register_connection`.
+
         Returns:
             :class:`pymongo.database.Database`
         """
+        if cls.__connection_alias__ is not None:
+            return connection.get_database(cls.__connection_alias__)
         raise NotImplementedError
 
+    @classmethod
+    def cache(cls):
+        """Get the document cache of this model. See :attr:`~__cache__`
+
+        Returns:
+            pymongoext.cache.DocumentCache: The cache or ``None`` if caching is disabled
+        """
+        config = cls.__cache__
+
+        def _build():
+            if not config:
+                return None
+            return DocumentCache(**config) if isinstance(config, dict) else DocumentCache()
+
+        return cls._runtime('document_cache', config, _build)
+
+    @classmethod
+    def watch_cache(cls, source=None, refresh=False):
+        """Keep the document cache coherent with writes made by other processes
+        by tailing the change stream of the collection in a background thread.
+        Requires :attr:`~__cache__` to be enabled.
+
+        Args:
+            source (callable): Opens the change stream, see :class:`pymongoext.cache.CacheInvalidator`
+            refresh (bool): Replace cached documents on update instead of evicting them
+
+        Returns:
+            pymongoext.cache.CacheInvalidator: The running invalidator. Call ``stop()`` to stop it
+        """
+        return CacheInvalidator(cls, source=source, refresh=refresh).start()
+
     @classmethod
     def name(cls):
         """Returns the collection name.
@@ -222,8 +687,38 @@ class Model(metaclass=_BindCollectionMethods):
             :class:`pymongo.collection.Collection`
         """
         if cls._should_update():
-            cls._update()
-        return cls.db()[cls.name()]
+            cls._sync()
+        return cls._collection()
+
+    @classmethod
+    def _database_config(cls):
+        """Returns the values the database of this model depends on"""
+        return cls.__connection_alias__, connection.generation(), getattr(cls.db, '__func__', cls.db)
+
+    @classmethod
+    def _database(cls):
+        """Returns the database of this model, cached until the connections are reset
+        or the connection alias or :meth:`~db` of the model change. See :func:`pymongoext.connection.reset`
+        """
+        return cls._runtime('database', cls._database_config(), cls.db)
+
+    @classmethod
+    def _collection(cls):
+        """Returns the collection of this model, cached until the database or collection name change"""
+        config = (cls._database_config(), cls.__collection_name__, cls.__name__)
+        return cls._runtime('collection', config, lambda: cls._database()[cls.name()])
+
+    @classmethod
+    def _raw_collection(cls):
+        """Returns the collection of this model configured to return ``RawBSONDocument`` s.
+        The other codec options of the collection, such as ``tz_aware``, are kept. Used by ``Model.find_raw``
+        """
+        collection = cls.c()
+        # Compared by identity first, as comparing collections of pymongo 3 selects a server
+        config = id(collection), collection
+        return cls._runtime('raw_collection', config, lambda: collection.with_options(
+            codec_options=collection.codec_options.with_options(document_class=RawBSONDocument)
+        ))
 
     @classmethod
     def apply_incoming_manipulators(cls, doc, action):
@@ -236,26 +731,40 @@ class Model(metaclass=_BindCollectionMethods):
         Returns:
             dict: the transformed document
         """
-        for manipulator in cls.manipulators():
-            if _manipulator_method_overwritten(manipulator, 'transform_incoming'):
-                doc = manipulator.transform_incoming(doc, cls, action)
+        for transform in cls._pipelines().incoming:
+            doc = transform(doc, cls, action)
         return doc
 
     @classmethod
-    def apply_outgoing_manipulators(cls, doc):
+    def apply_outgoing_manipulators(cls, doc, projection=None):
         """Apply manipulators to an outgoing document.
 
         Args:
             doc (dict): the document being retrieved from the database
+            projection (dict|list): the projection the document was retrieved with.
+                Manipulators whose :attr:`~pymongoext.manipulators.Manipulator.fields` are excluded are skipped
 
         Returns:
             dict: the transformed document
         """
-        if doc is not None:
-            for manipulator in cls.manipulators():
-                if _manipulator_method_overwritten(manipulator, 'transform_outgoing'):
-                    doc = manipulator.transform_outgoing(doc, cls)
-        return doc
+        return cls._pipelines(projection).apply_outgoing(doc, cls)
+
+    @classmethod
+    def apply_outgoing_manipulators_batch(cls, docs, projection=None):
+        """Apply manipulators to a batch of outgoing documents.
+
+        Each manipulator is applied once to the whole batch through
+        :meth:`pymongoext.manipulators.Manipulator.transform_outgoing_batch`.
+
+        Args:
+            docs (list of dict): the documents being retrieved from the database
+            projection (dict|list): the projection the documents were retrieved with.
+                See :meth:`~apply_outgoing_manipulators`
+
+        Returns:
+            list of dict: the transformed documents, in the same order
+        """
+        return cls._pipelines(projection).apply_outgoing_batch(docs, cls)
 
     @classmethod
     def parse(cls, data, with_defaults=False):
@@ -290,9 +799,53 @@ class Model(metaclass=_BindCollectionMethods):
         Returns:
             dict
         """
-        if isinstance(cls.__schema__, DictField):
-            return cls.__schema__.parse(data, with_defaults, is_schema=True)
-        return data
+        return cls._parser()(data, with_defaults)
+
+    @classmethod
+    def parse_update(cls, update):
+        """Prepare an update document to be sent to the db
+
+        The values of the ``$set``, ``$setOnInsert``, ``$inc``, ``$push`` and ``$addToSet`` operators are parsed
+        by the fields their keys refer to. Keys can be dotted paths into embedded documents and arrays,
+        including positional operators, e.g. ``products.0.name`` or ``products.$[].price``.
+        Keys that are not allowed by the schema are removed and unknown keys are left untouched.
+
+        Only the operators that are parsed are copied, the given update document is not modified.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            User.parse_update({'$set': {'age': '21', 'address.zip': '00100'}})
+            >>> {'$set': {'age': 21, 'address.zip': 100}}
+
+        Args:
+            update (dict): The update document
+
+        Returns:
+            dict
+        """
+        if not isinstance(cls.__schema__, DictField) or not isinstance(update, dict):
+            return update
+
+        index = cls._cached('path_index', lambda: cls.__schema__.compile_path_index(is_schema=True))
+        parsed = update
+        for operator, parse in _UPDATE_PARSERS.items():
+            fields = update.get(operator)
+            if fields:
+                if parsed is update:
+                    parsed = _shallow_copy(update)
+                parsed[operator] = parse(index, fields)
+        return parsed
+
+    @classmethod
+    def _parser(cls):
+        """Returns the parser compiled from the model schema. See :meth:`pymongoext.fields.DictField.compile_parser`"""
+        def _build():
+            if isinstance(cls.__schema__, DictField):
+                return cls.__schema__.compile_parser(is_schema=True)
+            return lambda data, with_defaults: data
+
+        return cls._cached('parser', _build)
 
     @classmethod
     def manipulators(cls):
@@ -329,6 +882,92 @@ class Model(metaclass=_BindCollectionMethods):
         _extract_manipulators(cls)
         return sorted(mans.values(), key=lambda man: man.priority)
 
+    @classmethod
+    def _pipelines(cls, projection=None):
+        """Returns the ``(incoming, outgoing, outgoing_batch)`` manipulator pipelines of this model.
+
+        Each pipeline is a tuple of bound ``transform_incoming``, ``transform_outgoing``
+        or ``transform_outgoing_batch`` methods, sorted by priority
+        and holding only the manipulators that override the respective method.
+        Manipulators overriding only one of the outgoing methods are part of both outgoing pipelines.
+
+        If a projection is given, the outgoing pipelines leave out the manipulators that declare
+        :attr:`pymongoext.manipulators.Manipulator.fields` excluded by the projection.
+
+        The pipelines are built once per model and combination of excluded manipulators,
+        so the number of cached pipelines does not grow with the number of distinct projections.
+        They are rebuilt after the model is modified.
+        Cursors get them once per query and apply them with ``apply_outgoing`` and ``apply_outgoing_batch``.
+
+        Args:
+            projection (dict|list): The projection of the query the documents are retrieved with
+
+        Returns:
+            _Pipelines
+        """
+        declared = cls._cached('manipulator_fields', _declared_fields, cls)
+        present = _presence(declared, projection) if declared and projection else None
+        return cls._cached(('pipelines', present), _build_pipelines, cls, present)
+
+    @classmethod
+    def _cached(cls, key, factory, *args):
+        """Get a value derived from the model definition, computing it with ``factory`` on first access.
+
+        Values are cached per model class and discarded by :meth:`~_invalidate_cache`
+        which is called whenever an attribute of the model or one of its bases is set or deleted.
+
+        Args:
+            key (Hashable): The cache key
+            factory (callable): Computes the value if it is not cached
+            *args: Arguments passed to ``factory``
+
+        Returns:
+            The cached value
+        """
+        try:
+            cache = _CLASS_CACHE[cls]
+        except KeyError:
+            cache = _CLASS_CACHE.setdefault(cls, {})
+
+        try:
+            return cache[key]
+        except KeyError:
+            return cache.setdefault(key, factory(*args))
+
+    @classmethod
+    def _runtime(cls, name, config, factory):
+        """Get a piece of runtime state of the model, such as a database handle, creating it with ``factory``.
+
+        Unlike :meth:`~_cached`, the state survives changes to unrelated attributes of the model.
+        It is only created again when ``config``, the values it was created from, changes.
+
+        Args:
+            name (str): The name of the state
+            config: The values the state depends on, compared by equality
+            factory (callable): Creates the state
+
+        Returns:
+            The state
+        """
+        state = _RUNTIME_STATE.get(cls)
+        entry = None if state is None else state.get(name)
+        if entry is not None and entry[0] == config:
+            return entry[1]
+
+        with _RUNTIME_LOCK:
+            state = _RUNTIME_STATE.setdefault(cls, {})
+            entry = state.get(name)
+            if entry is None or entry[0] != config:
+                entry = state[name] = (config, factory())
+            return entry[1]
+
+    @classmethod
+    def _invalidate_cache(cls):
+        """Discard the cached values of this model and all its subclasses"""
+        _CLASS_CACHE.pop(cls, None)
+        for subclass in cls.__subclasses__():
+            subclass._invalidate_cache()
+
     # default manipulators
     IdWithoutUnderscoreManipulator = IdWithoutUnderscoreManipulator
     ParseInputsManipulator = ParseInputsManipulator
@@ -382,59 +1021,141 @@ class Model(metaclass=_BindCollectionMethods):
 
         return [_model(i) for i in cls.__indexes__]
 
-    _UPTO_DATE = []
-    """Cache for collections that are upto date"""
+    _UPTO_DATE = _SyncRegistry()
+    """Registry of the ``(database, collection)`` pairs that are upto date"""
+
+    @classmethod
+    def _sync_key(cls):
+        """Returns the ``(client, database, collection)`` key of this model in :attr:`~_UPTO_DATE`.
+        The client is identified by its seed addresses, so that databases with the same name on different servers
+        are kept apart
+        """
+        db = cls._database()
+        return _client_key(getattr(db, 'client', None)), getattr(db, 'name', None), cls.name()
 
     @classmethod
     def _on_update(cls):
         """Method called on successful update"""
-        Model._UPTO_DATE.append(cls.name())
+        Model._UPTO_DATE.add(cls._sync_key())
 
     @classmethod
     def _should_update(cls):
         """Checks if we should update the collection meta"""
-        return cls.__auto_update__ and cls.name() not in Model._UPTO_DATE
+        return bool(cls.__auto_update__) and cls._sync_key() not in Model._UPTO_DATE
+
+    @classmethod
+    def _sync(cls):
+        """Update the collection meta once per ``(database, collection)``.
+
+        Concurrent callers wait for a single update to complete.
+        If ``__auto_update__`` is ``'background'``, the update is started in a background thread instead.
+        """
+        if cls.__auto_update__ == 'background':
+            cls._update_in_background()
+            return
+
+        key = cls._sync_key()
+        with Model._UPTO_DATE.lock(key):
+            if key not in Model._UPTO_DATE:
+                cls._update()
+
+    @classmethod
+    def _update_in_background(cls):
+        """Start updating the collection meta in a daemon thread.
+
+        Does nothing if the collection is up to date or an update is already running.
+        A failed update is logged and retried on the next operation on the collection.
+
+        Returns:
+            threading.Thread: The thread running the update or ``None`` if the collection is up to date
+        """
+        key = cls._sync_key()
+
+        def _target():
+            try:
+                with Model._UPTO_DATE.lock(key):
+                    if key not in Model._UPTO_DATE:
+                        cls._update()
+            except Exception:
+                _logger.exception('Background update of collection %s failed', cls.name())
+
+        return Model._UPTO_DATE.start_thread(key, _target)
+
+    @classmethod
+    def _pymongo_db(cls):
+        """Returns the pymongo database on which :meth:`~_update` runs its commands. Defaults to :meth:`~db`"""
+        return cls._database()
 
     @classmethod
-    def _update(cls):
-        """Runs validator & index update commands on database"""
-        db = cls.db()
+    def _update(cls, collection_info=None, rebuild=None):
+        """Runs validator & index update commands on database
+
+        Args:
+            collection_info (dict): The entry of the collection returned by ``listCollections``, if already fetched.
+                ``False`` if the collection is known not to exist
+            rebuild (bool): Rebuild the indexes whose definition changed. Defaults to :attr:`~__rebuild_indexes__`
+        """
+        db = cls._pymongo_db()
         name = cls.name()
         validator = cls._validator()
         indexes = cls._indexes()
         collection = db[name]
 
+        if collection_info is None:
+            collection_info = next(iter(db.list_collections(filter={'name': name})), False)
+
         # Create or update validator
-        try:
-            collection = Collection(db, name, validator=validator)
-        except OperationFailure:
-            db.command({
-                "collMod": name,
-                "validator": validator
-            })
+        if collection_info is False:
+            try:
+                collection = Collection(db, name, validator=validator)
+                _logger.info('Created collection %s with its validator', name)
+            except OperationFailure:
+                # Created concurrently
+                collection_info = {}
+
+        if collection_info is not False:
+            current = collection_info.get('options', {}).get('validator') or {}
+            if _canonical_schema(current) == _canonical_schema(validator):
+                _logger.debug('Validator of %s is up to date, skipping collMod', name)
+            else:
+                _logger.info('Updating the validator of %s', name)
+                db.command({
+                    "collMod": name,
+                    "validator": validator
+                })
 
         # Update Indexes
-        i_names = [model.document['name'] for model in indexes]
-        existing = list(collection.index_information().keys())
-
-        for name in existing:
-            if name != '_id_' and name not in i_names:
-                collection.drop_index(name)
-
-        to_create = [model for model in indexes if model.document['name'] not in existing]
-        if len(to_create) > 0:
-            collection.create_indexes(indexes)
+        if rebuild is None:
+            rebuild = cls.__rebuild_indexes__
+        index_plan(indexes, collection.index_information()).apply(collection, rebuild=rebuild)
 
         # Set as updated
         cls._on_update()
 
     @classmethod
-    def _limited_cursor(cls, filter_, limit, *args, **kwargs):
-        """Helper method to create cursor.
+    def index_plan(cls):
+        """Compare the declared :attr:`~__indexes__` to the indexes of the collection without changing anything.
+
+        This is a dry run of the index update made when the model is synced.
+
+        Returns:
+            pymongoext.indexes.IndexPlan: The indexes that would be created, rebuilt and dropped
+        """
+        collection = cls._pymongo_db()[cls.name()]
+        return index_plan(cls._indexes(), collection.index_information())
+
+    @classmethod
+    def _limited_cursor(cls, filter_, limit, *args, hint=None, **kwargs):
+        """Helper method to create a raw cursor that returns at most ``limit`` documents in a single batch.
 
+        The documents are not passed through the outgoing manipulators.
         See :meth:`~exists` and :meth:`~get` on how it is used
         """
         if filter_ is not None and not isinstance(filter_, dict):
             filter_ = {"_id": filter_}
 
-        return cls.find(filter_, *args, **kwargs).limit(limit)
+        # A negative limit returns a single batch and closes the cursor
+        cursor = cls.c().find(filter_, *args, **kwargs).limit(-limit)
+        if hint is not None:
+            cursor = cursor.hint(hint)
+        return cursor
@@ -0,0 +1,142 @@
+import struct
+from collections.abc import Mapping
+import bson
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+from bson.raw_bson import RawBSONDocument
+
+__all__ = [
+	'LazyBSONDocument'
+]
+
+_INT32 = struct.Struct('<i')
+
+_FIXED_SIZES = {
+	0x01: 8,  # double
+	0x06: 0,  # undefined
+	0x07: 12,  # ObjectId
+	0x08: 1,  # boolean
+	0x09: 8,  # UTC datetime
+	0x0A: 0,  # null
+	0x10: 4,  # int32
+	0x11: 8,  # timestamp
+	0x12: 8,  # int64
+	0x13: 16,  # decimal128
+	0x7F: 0,  # max key
+	0xFF: 0,  # min key
+}
+
+_LENGTH_PREFIXED = {
+	0x02: 4,  # string: int32 length + bytes
+	0x0D: 4,  # javascript code
+	0x0E: 4,  # symbol
+	0x05: 5,  # binary: int32 length + subtype + bytes
+}
+
+_SELF_SIZED = (0x03, 0x04, 0x0F)  # document, array and code with scope include their own size
+
+
+def _value_size(element_type, data, start):
+	"""Size in bytes of a BSON value of the given type starting at ``start``"""
+	try:
+		return _FIXED_SIZES[element_type]
+	except KeyError:
+		pass
+
+	if element_type in _LENGTH_PREFIXED:
+		return _LENGTH_PREFIXED[element_type] + _INT32.unpack_from(data, start)[0]
+
+	if element_type in _SELF_SIZED:
+		return _INT32.unpack_from(data, start)[0]
+
+	if element_type == 0x0B:  # regex: pattern and options cstrings
+		end = data.index(b'\x00', data.index(b'\x00', start) + 1)
+		return end + 1 - start
+
+	if element_type == 0x0C:  # DBPointer: string + ObjectId
+		return 4 + _INT32.unpack_from(data, start)[0] + 12
+
+	raise bson.errors.InvalidBSON('Unknown BSON element type {:#x}'.format(element_type))
+
+
+def _index(data):
+	"""Map each top level key of a BSON document to the ``(start, value_start, end)`` offsets of its element"""
+	index = {}
+	position = 4
+	end = len(data) - 1
+	while position < end:
+		element_type = data[position]
+		name_end = data.index(b'\x00', position + 1)
+		value_start = name_end + 1
+		value_end = value_start + _value_size(element_type, data, value_start)
+		index[data[position + 1:name_end].decode('utf-8')] = (position, value_start, value_end)
+		position = value_end
+	return index
+
+
+class LazyBSONDocument(Mapping):
+	"""A read-only document that decodes only the values that are accessed.
+
+	Unlike ``bson.raw_bson.RawBSONDocument``, which decodes the whole document on first access,
+	only the element headers are scanned and each value is decoded the first time its key is read.
+	Embedded documents, other than DBRefs, are returned as :class:`~LazyBSONDocument` too.
+	The original bytes remain available through :attr:`~raw`.
+
+	Args:
+		bson_bytes (bytes): The BSON bytes of the document
+		codec_options (bson.codec_options.CodecOptions): Options used to decode values.
+			The ``document_class`` is ignored
+	"""
+
+	__slots__ = ('_raw', '_codec_options', '_offsets', '_values')
+
+	def __init__(self, bson_bytes, codec_options=DEFAULT_CODEC_OPTIONS):
+		self._raw = bson_bytes
+		self._codec_options = codec_options.with_options(document_class=dict)
+		self._offsets = None
+		self._values = {}
+
+	@property
+	def raw(self):
+		"""bytes: The raw BSON bytes composing this document"""
+		return self._raw
+
+	def _index(self):
+		if self._offsets is None:
+			self._offsets = _index(self._raw)
+		return self._offsets
+
+	def __getitem__(self, key):
+		try:
+			return self._values[key]
+		except KeyError:
+			pass
+
+		start, value_start, end = self._index()[key]
+		data = self._raw
+
+		if data[start] == 0x03 and data[value_start + 5:value_start + 10] != b'$ref\x00':
+			value = LazyBSONDocument(data[value_start:end], self._codec_options)
+		else:
+			element = data[start:end]
+			document = _INT32.pack(len(element) + 5) + element + b'\x00'
+			value = bson.decode(document, self._codec_options)[key]
+
+		self._values[key] = value
+		return value
+
+	def __iter__(self):
+		return iter(self._index())
+
+	def __len__(self):
+		return len(self._index())
+
+	def __contains__(self, key):
+		return key in self._index()
+
+	def __eq__(self, other):
+		if isinstance(other, (LazyBSONDocument, RawBSONDocument)):
+			return self._raw == other.raw
+		return super().__eq__(other)
+
+	def __repr__(self):
+		return 'LazyBSONDocument({!r})'.format(self._raw)
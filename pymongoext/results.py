@@ -0,0 +1,74 @@
+from collections import namedtuple
+from pymongo.results import InsertManyResult, BulkWriteResult
+
+__all__ = [
+	'ChunkTiming',
+	'SyncTiming',
+	'ChunkedInsertManyResult',
+	'ChunkedBulkWriteResult'
+]
+
+
+ChunkTiming = namedtuple('ChunkTiming', ['size', 'manipulate_time', 'write_time'])
+"""Timings, in seconds, of a single chunk of a chunked write.
+
+Attributes:
+	size (int): Number of documents in the chunk
+	manipulate_time (float): Time spent applying the incoming manipulators
+	write_time (float): Time spent waiting for the server to acknowledge the write
+"""
+
+
+SyncTiming = namedtuple('SyncTiming', ['model', 'duration', 'error'])
+"""Outcome of syncing the validator and indexes of a single model with :func:`pymongoext.sync.sync_models`
+
+Attributes:
+	model (type): The model
+	duration (float): Time spent, in seconds, including waiting for a concurrent sync of the same collection
+	error (Exception): The error raised by the sync or ``None`` if it succeeded
+"""
+
+
+class ChunkedInsertManyResult(InsertManyResult):
+	"""The return type of :meth:`pymongoext.model.Model.insert_many` when called with a ``chunk_size``
+
+	Args:
+		inserted_ids (list): The _ids of the inserted documents, in the order provided
+		acknowledged (bool): ``True`` if all the writes were acknowledged
+		chunks (list of ChunkTiming): Timings of each chunk, in the order they were sent
+	"""
+
+	__slots__ = ('__chunks',)
+
+	def __init__(self, inserted_ids, acknowledged, chunks):
+		self.__chunks = chunks
+		super().__init__(inserted_ids, acknowledged)
+
+	@property
+	def chunks(self):
+		"""list of :class:`ChunkTiming`: Timings of each chunk, in the order they were sent"""
+		return self.__chunks
+
+
+class ChunkedBulkWriteResult(BulkWriteResult):
+	"""The return type of :meth:`pymongoext.model.Model.bulk_write` when called with a ``batch_size``
+
+	The counts and upserted ids are aggregated over all batches.
+	Indexes in ``upserted_ids`` refer to positions in the original list of requests.
+
+	Args:
+		bulk_api_result (dict): The merged result dicts of all batches
+		acknowledged (bool): ``True`` if all the writes were acknowledged
+		chunks (list of ChunkTiming): Timings of each batch, in the order they were sent
+	"""
+
+	__slots__ = ('__chunks',)
+
+	def __init__(self, bulk_api_result, acknowledged, chunks):
+		self.__chunks = chunks
+		super().__init__(bulk_api_result, acknowledged)
+
+	@property
+	def chunks(self):
+		"""list of :class:`ChunkTiming`: Timings of each batch, in the order they were sent"""
+		return self.__chunks
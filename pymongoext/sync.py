@@ -0,0 +1,107 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pymongoext.model import Model
+from pymongoext.results import SyncTiming
+
+__all__ = [
+    'discover_models',
+    'sync_models'
+]
+
+_logger = logging.getLogger(__name__)
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def discover_models():
+    """Find the concrete models, in definition order
+
+    Models whose :meth:`pymongoext.model.Model.db` raises ``NotImplementedError``, such as abstract base models,
+    and models with ``__auto_update__`` set to ``False`` are skipped.
+
+    Returns:
+        list of type
+    """
+    models = []
+    for model in _subclasses(Model):
+        if model in models or not model.__auto_update__:
+            continue
+        try:
+            model._database()
+        except NotImplementedError:
+            continue
+        models.append(model)
+    return models
+
+
+def _sync_model(model, collection_info):
+    """Update the collection meta of a model unless already up to date"""
+    key = model._sync_key()
+    start = time.perf_counter()
+    error = None
+    try:
+        with Model._UPTO_DATE.lock(key):
+            if key not in Model._UPTO_DATE:
+                model._update(collection_info)
+    except Exception as e:
+        _logger.exception('Sync of collection %s failed', model.name())
+        error = e
+    return SyncTiming(model, time.perf_counter() - start, error)
+
+
+def sync_models(models=None, workers=8):
+    """Sync the validators and indexes of many models at once, typically at startup.
+
+    The collections of each database are listed with a single ``listCollections`` command,
+    then the collections are updated concurrently. Each collection is synced once even if several models share it,
+    the models sharing it get the timing of that sync.
+    A failed sync is logged and reported, the model is synced again on its first operation.
+
+    Examples:
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from pymongoext import sync_models
+
+            for timing in sync_models(workers=16):
+                print(timing.model.__name__, timing.duration)
+
+    Args:
+        models (list of type): The models to sync. Defaults to :func:`discover_models`
+        workers (int): The maximum number of collections updated concurrently
+
+    Returns:
+        list of pymongoext.results.SyncTiming: One entry per model, in the order of ``models``
+    """
+    if models is None:
+        models = discover_models()
+
+    keys = [model._sync_key() for model in models]
+    targets = {}
+    for key, model in zip(keys, models):
+        targets.setdefault(key, model)
+
+    databases = {}
+    for (client, db_name, name), model in targets.items():
+        if (client, db_name, name) not in Model._UPTO_DATE:
+            databases.setdefault((client, db_name), []).append(model)
+
+    collection_info = {}
+    for db_models in databases.values():
+        db = db_models[0]._pymongo_db()
+        names = [model.name() for model in db_models]
+        found = {info['name']: info for info in db.list_collections(filter={'name': {'$in': names}})}
+        for model in db_models:
+            collection_info[model] = found.get(model.name(), False)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            key: executor.submit(_sync_model, model, collection_info.get(model)) for key, model in targets.items()
+        }
+        return [futures[key].result()._replace(model=model) for key, model in zip(keys, models)]
@@ -0,0 +1,65 @@
+"""In-process fakes of MongoDB drivers used by the tests"""
+import mongomock
+
+
+class FakeAsyncCursor:
+	"""An asynchronous cursor over a mongomock cursor, with the interface of a Motor cursor"""
+
+	def __init__(self, cursor):
+		self.cursor = cursor
+
+	def limit(self, limit):
+		self.cursor = self.cursor.limit(limit)
+		return self
+
+	def sort(self, *args, **kwargs):
+		self.cursor = self.cursor.sort(*args, **kwargs)
+		return self
+
+	def hint(self, index):
+		return self
+
+	def __aiter__(self):
+		return self
+
+	async def __anext__(self):
+		try:
+			return next(self.cursor)
+		except StopIteration:
+			raise StopAsyncIteration
+
+	async def to_list(self, length):
+		docs = []
+		for doc in self.cursor:
+			docs.append(doc)
+			if length is not None and len(docs) >= length:
+				break
+		return docs
+
+
+class FakeAsyncCollection:
+	"""An asynchronous collection over a mongomock collection, with the interface of a Motor collection"""
+
+	def __init__(self, collection):
+		self.collection = collection
+
+	def find(self, *args, **kwargs):
+		return FakeAsyncCursor(self.collection.find(*args, **kwargs))
+
+	def __getattr__(self, item):
+		method = getattr(self.collection, item)
+
+		async def _method(*args, **kwargs):
+			return method(*args, **kwargs)
+		return _method
+
+
+class FakeAsyncDatabase:
+	"""An asynchronous database over a mongomock database, with the interface of a Motor database"""
+
+	def __init__(self, name='test'):
+		self.delegate = mongomock.MongoClient()[name]
+		self.name = name
+
+	def __getitem__(self, name):
+		return FakeAsyncCollection(self.delegate[name])
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from pymongoext import AsyncModel, DictField, StringField, IntField
+from pymongoext.exceptions import NoDocumentFound, MultipleDocumentsFound
+from tests.fakes import FakeAsyncDatabase
+
+_db = FakeAsyncDatabase()
+
+
+class Person(AsyncModel):
+	__auto_update__ = False
+	__cache__ = True
+	__schema__ = DictField(dict(
+		name=StringField(required=True),
+		age=IntField(default=0)
+	))
+
+	@classmethod
+	def db(cls):
+		return _db
+
+
+def run(coroutine):
+	return asyncio.run(coroutine)
+
+
+def test_insert_and_read():
+	async def scenario():
+		await Person.delete_many({})
+		_id = (await Person.insert_one({'name': 'Ann'})).inserted_id
+		await Person.insert_many([{'name': 'Bob', 'age': 20}, {'name': 'Cid', 'age': 20}])
+
+		doc = await Person.find_one({'_id': _id})
+		assert doc.name == 'Ann' and doc.age == 0
+		assert (await Person.get({'name': 'Bob'})).age == 20
+		assert await Person.exists({'name': 'Cid'})
+		assert not await Person.exists({'name': 'Dan'})
+
+		with pytest.raises(NoDocumentFound):
+			await Person.get({'name': 'Dan'})
+		with pytest.raises(MultipleDocumentsFound):
+			await Person.get({'age': 20})
+
+		await Person.update_many({'age': 20}, {'$inc': {'age': 1}})
+		assert (await Person.get({'name': 'Cid'})).age == 21
+
+	run(scenario())
+
+
+def test_cursor_iteration():
+	async def scenario():
+		await Person.delete_many({})
+		await Person.insert_many([{'name': str(i), 'age': i} for i in range(5)])
+
+		ages = [doc.age async for doc in Person.find({'age': {'$gte': 1}}).sort('age')]
+		assert ages == [1, 2, 3, 4]
+
+		docs = await Person.find().sort('age', -1).limit(2).to_list(None)
+		assert [doc.name for doc in docs] == ['4', '3']
+
+	run(scenario())
+
+
+def test_writes_invalidate_the_cache():
+	async def scenario():
+		_id = (await Person.insert_one({'name': 'Jane', 'age': 30})).inserted_id
+		assert (await Person.loader().get(_id)).age == 30
+		assert _id in Person.cache()
+
+		await Person.update_one({'_id': _id}, {'$set': {'age': 31}})
+		assert (await Person.loader().get(_id)).age == 31
+
+		await Person.find_one_and_update({'_id': _id}, {'$set': {'age': 32}})
+		assert (await Person.loader().get(_id)).age == 32
+
+		await Person.delete_one({'_id': _id})
+		assert _id not in Person.cache()
+		assert await Person.find_one({'_id': _id}) is None
+
+	run(scenario())
+
+
+def test_bulk_write():
+	from pymongo import InsertOne, UpdateOne
+
+	async def scenario():
+		await Person.delete_many({})
+		result = await Person.bulk_write([InsertOne({'name': 1}), InsertOne({'name': 2})])
+		assert result.inserted_count == 2
+
+		requests = [InsertOne({'name': str(i)}) for i in range(5)] + [UpdateOne({'name': '1'}, {'$set': {'age': '7'}})]
+		result = await Person.bulk_write(iter(requests), batch_size=2)
+		assert result.inserted_count == 5 and result.modified_count == 1
+		assert [chunk.size for chunk in result.chunks] == [2, 2, 2]
+		assert (await Person.find_one({'name': '1'})).age == 7
+
+	run(scenario())
+
+
+def test_sync_only_apis_are_rejected():
+	for name in ('find_raw', 'find_raw_batches', 'find_columns', 'export', 'export_columns'):
+		with pytest.raises(NotImplementedError):
+			getattr(Person, name)()
+
+	with pytest.raises(NotImplementedError):
+		run(Person.insert_many([{'name': 'x'}], chunk_size=10))
+
+
+def test_cursor_syncs_once(monkeypatch):
+	calls = []
+
+	async def ensure_updated():
+		calls.append(1)
+
+	async def scenario():
+		await Person.delete_many({})
+		await Person.insert_many([{'name': str(i)} for i in range(3)])
+		monkeypatch.setattr(Person, '_ensure_updated', ensure_updated)
+		assert len([doc async for doc in Person.find()]) == 3
+
+	run(scenario())
+	assert len(calls) == 1
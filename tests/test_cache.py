@@ -0,0 +1,86 @@
+import threading
+import mongomock
+from pymongoext import Model, Manipulator
+from pymongoext.cache import DocumentCache
+
+_pause = {}
+
+
+class Cached(Model):
+	__auto_update__ = False
+	__cache__ = True
+	client = mongomock.MongoClient()
+
+	@classmethod
+	def db(cls):
+		return cls.client['test']
+
+	class PauseManipulator(Manipulator):
+		def transform_outgoing(self, doc, model):
+			# Lets a test write concurrently after the document has been read
+			if 'reading' in _pause:
+				_pause.pop('reading').set()
+				_pause.pop('written').wait(5)
+			return doc
+
+
+def test_lru_eviction_and_copies():
+	cache = DocumentCache(maxsize=2)
+	doc = {'_id': 1, 'tags': []}
+	cache.set(1, doc)
+	doc['tags'].append('x')
+	assert cache.get(1) == {'_id': 1, 'tags': []}
+
+	cache.set(2, {'_id': 2})
+	cache.get(1)
+	cache.set(3, {'_id': 3})
+	assert 2 not in cache and 1 in cache and 3 in cache
+	assert cache.stats().evictions == 1
+
+
+def test_set_is_skipped_after_invalidation():
+	cache = DocumentCache()
+	generation = cache.generation
+	cache.invalidate(1)
+	cache.set(1, {'_id': 1, 'n': 'stale'}, generation)
+	assert cache.get(1) is None
+
+	generation = cache.generation
+	cache.set(1, {'_id': 1, 'n': 'fresh'}, generation)
+	assert cache.get(1)['n'] == 'fresh'
+
+
+def test_read_through_does_not_store_stale_document():
+	_id = Cached.insert_one({'n': 1}).inserted_id
+	cache = Cached.cache()
+	reading = _pause['reading'] = threading.Event()
+	written = _pause['written'] = threading.Event()
+
+	reader = threading.Thread(target=Cached.get, args=(_id,))
+	reader.start()
+	reading.wait(5)
+	Cached.update_one({'_id': _id}, {'$set': {'n': 2}})
+	written.set()
+	reader.join(5)
+
+	assert cache.get(_id) is None
+	assert Cached.get(_id)['n'] == 2
+	assert cache.get(_id)['n'] == 2
+
+
+def test_cache_survives_unrelated_attribute_changes():
+	_id = Cached.insert_one({'n': 1}).inserted_id
+	cache = Cached.cache()
+	Cached.get(_id)
+
+	Cached.unrelated = 1
+	del Cached.unrelated
+	assert Cached.cache() is cache
+	assert _id in cache
+
+	Cached.__cache__ = dict(maxsize=10)
+	try:
+		assert Cached.cache() is not cache
+		assert Cached.cache().maxsize == 10
+	finally:
+		Cached.__cache__ = True
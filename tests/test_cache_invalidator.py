@@ -0,0 +1,127 @@
+import time
+import mongomock
+from pymongo.errors import OperationFailure
+from pymongoext import Model
+from pymongoext.cache import CacheInvalidator
+
+
+class Watched(Model):
+	__auto_update__ = False
+	__cache__ = True
+	client = mongomock.MongoClient()
+
+	@classmethod
+	def db(cls):
+		return cls.client['test']
+
+
+class FakeSource:
+	"""Opens scripted streams. Each stream is a list of events, or an exception raised after its events"""
+
+	def __init__(self, invalidator_factory, *streams):
+		self.streams = list(streams)
+		self.tokens = []
+		self.invalidator = invalidator_factory(self)
+
+	def __call__(self, resume_token):
+		self.tokens.append(resume_token)
+		if not self.streams:
+			self.invalidator._stop.set()
+			return []
+		return self._stream(self.streams.pop(0))
+
+	@staticmethod
+	def _stream(events):
+		for event in events:
+			if isinstance(event, Exception):
+				raise event
+			yield event
+
+
+def _invalidator(source, **kwargs):
+	return CacheInvalidator(Watched, source=source, retry_delay=0.001, **kwargs)
+
+
+def _change(operation, key, token, **kwargs):
+	return dict(_id={'_data': token}, operationType=operation, documentKey={'_id': key}, **kwargs)
+
+
+def _fill(*keys):
+	cache = Watched.cache()
+	cache.clear()
+	for key in keys:
+		cache.set(key, {'_id': key, 'n': 0})
+	return cache
+
+
+def test_evict_and_refresh():
+	cache = _fill(1, 2)
+	invalidator = _invalidator(lambda token: [])
+	invalidator.handle(_change('update', 1, 'a', fullDocument={'_id': 1, 'n': 1}))
+	invalidator.handle(_change('delete', 3, 'b'))
+	assert 1 not in cache and 2 in cache
+
+	invalidator = _invalidator(lambda token: [], refresh=True)
+	invalidator.handle(_change('replace', 2, 'c', fullDocument={'_id': 2, 'n': 2}))
+	invalidator.handle(_change('update', 3, 'd', fullDocument={'_id': 3, 'n': 3}))
+	assert cache.get(2)['n'] == 2
+	assert 3 not in cache
+
+
+def test_flush_on_collection_events():
+	for operation in ('drop', 'rename', 'invalidate'):
+		cache = _fill(1, 2)
+		invalidator = _invalidator(lambda token: [])
+		invalidator.resume_token = 'a'
+		invalidator.handle({'_id': {'_data': 'b'}, 'operationType': operation})
+		assert len(cache) == 0
+		assert (invalidator.resume_token is None) == (operation == 'invalidate')
+
+
+def _marking(source, cache):
+	"""Caches a marker document each time a stream is opened, to tell which openings flushed the cache"""
+	def opener(token):
+		cache.set('opened-{}'.format(len(source.tokens)), {})
+		return source(token)
+	return opener
+
+
+def test_resume_after_interruption():
+	cache = _fill(1, 2)
+	source = FakeSource(
+		_invalidator,
+		[_change('delete', 1, 'a'), RuntimeError('connection lost')],
+		[_change('delete', 2, 'b')],
+	)
+	source.invalidator.source = _marking(source, cache)
+	source.invalidator._run()
+
+	assert source.tokens == [None, {'_data': 'a'}, {'_data': 'b'}]
+	# Only the stream opened without a resume token flushed the cache
+	assert sorted(cache._data) == ['opened-1', 'opened-2']
+
+
+def test_flush_when_stream_cannot_resume():
+	cache = _fill(1)
+	source = FakeSource(
+		_invalidator,
+		[_change('delete', 3, 'a'), OperationFailure('history lost')],
+		[_change('delete', 4, 'b')],
+	)
+	source.invalidator.source = _marking(source, cache)
+	source.invalidator._run()
+
+	assert source.tokens == [None, None, {'_data': 'b'}]
+	assert sorted(cache._data) == ['opened-2']
+
+
+def test_streams_are_not_reopened_in_a_busy_loop():
+	opens = []
+	invalidator = CacheInvalidator(Watched, source=lambda token: opens.append(token) or [], retry_delay=0.01)
+	invalidator.start()
+	time.sleep(0.3)
+	invalidator.stop(5)
+
+	# 0.01 + 0.02 + 0.04 + 0.08 + 0.16 seconds of backoff
+	assert 1 < len(opens) <= 6
+	assert not invalidator.running
@@ -0,0 +1,62 @@
+import mongomock
+import pytest
+from pymongo.errors import BulkWriteError
+from pymongoext import Model, Manipulator
+from pymongoext.exceptions import DocumentManipulationError
+
+
+class Chunked(Model):
+	__auto_update__ = False
+	client = mongomock.MongoClient()
+
+	@classmethod
+	def db(cls):
+		return cls.client['test']
+
+	class RejectManipulator(Manipulator):
+		def transform_incoming(self, doc, model, action):
+			if doc.get('bad'):
+				raise ValueError('bad document')
+			return doc
+
+
+def test_insert_many_chunked():
+	Chunked.delete_many({})
+	result = Chunked.insert_many(({'n': i} for i in range(7)), chunk_size=3)
+	assert [chunk.size for chunk in result.chunks] == [3, 3, 1]
+	assert len(result.inserted_ids) == 7
+	assert [doc.n for doc in Chunked.find(sort=[('n', 1)])] == list(range(7))
+
+
+def test_insert_many_chunked_failure():
+	Chunked.delete_many({})
+	Chunked.insert_one({'_id': 5})
+
+	with pytest.raises(BulkWriteError) as info:
+		Chunked.insert_many(({'_id': i} for i in range(10)), chunk_size=3)
+
+	details = info.value.details
+	assert [error['index'] for error in details['writeErrors']] == [5]
+	assert details['insertedIds'] == [0, 1, 2, 3, 4]
+	assert details['nInserted'] == 5
+	assert [chunk.size for chunk in details['chunks']] == [3, 3]
+	assert Chunked.count_documents({}) == 6
+
+
+def test_insert_many_chunked_write_and_manipulation_failure():
+	Chunked.delete_many({})
+	Chunked.insert_one({'_id': 1})
+	documents = [{'_id': 0}, {'_id': 1}, {'_id': 2}, {'_id': 3, 'bad': True}]
+
+	with pytest.raises(BulkWriteError) as info:
+		Chunked.insert_many(iter(documents), chunk_size=3)
+	details = info.value.details
+	assert [error['index'] for error in details['writeErrors']] == [1]
+	assert details['insertedIds'] == [0]
+
+	Chunked.delete_many({})
+	with pytest.raises(DocumentManipulationError) as info:
+		Chunked.insert_many(iter(documents), chunk_size=3)
+	assert info.value.index == 3
+	assert info.value.inserted_ids == [0, 1, 2]
+	assert [chunk.size for chunk in info.value.chunks] == [3]
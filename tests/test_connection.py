@@ -0,0 +1,81 @@
+import os
+import mongomock
+import pytest
+from pymongoext import Model, connection
+from pymongoext.connection import register_connection, get_client, get_database, disconnect, reset
+
+
+class Closing(mongomock.MongoClient):
+	"""Records whether the client was closed"""
+
+	closed = False
+
+	def close(self):
+		self.closed = True
+
+
+class Aliased(Model):
+	__auto_update__ = False
+	__connection_alias__ = 'test-connection'
+
+
+def test_clients_are_shared_per_alias():
+	register_connection('db1', alias='test-connection', client_class=Closing)
+	client = get_client('test-connection')
+	assert get_client('test-connection') is client
+	assert get_database('test-connection').name == 'db1'
+
+	with pytest.raises(KeyError):
+		get_client('test-unknown')
+
+
+def test_models_follow_registrations():
+	register_connection('db1', alias='test-connection', client_class=Closing)
+	collection = Aliased.c()
+	assert collection.database.name == 'db1'
+	assert Aliased.c() is collection
+
+	old = get_client('test-connection')
+	register_connection('db2', alias='test-connection', client_class=Closing)
+	assert old.closed
+	assert Aliased.c().database.name == 'db2'
+
+
+def test_disconnect_and_reset():
+	register_connection('db1', alias='test-connection', client_class=Closing)
+	client = get_client('test-connection')
+	collection = Aliased.c()
+
+	disconnect('test-connection')
+	assert client.closed
+	assert get_client('test-connection') is not client
+	assert Aliased.c() is not collection
+
+	client = get_client('test-connection')
+	collection = Aliased.c()
+	generation = connection.generation()
+	reset()
+	assert not client.closed
+	assert connection.generation() != generation
+	assert get_client('test-connection') is not client
+	assert Aliased.c() is not collection
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requires os.fork')
+def test_reset_after_fork():
+	register_connection('db1', alias='test-connection', client_class=Closing)
+	client = get_client('test-connection')
+	read, write = os.pipe()
+
+	pid = os.fork()
+	if pid == 0:
+		try:
+			os.write(write, b'1' if get_client('test-connection') is not client else b'0')
+		finally:
+			os._exit(0)
+
+	os.waitpid(pid, 0)
+	assert os.read(read, 1) == b'1'
+	os.close(read)
+	os.close(write)
+	assert get_client('test-connection') is client
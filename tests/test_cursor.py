@@ -0,0 +1,81 @@
+import copy
+from collections import deque
+import mongomock
+from pymongoext import Model, Manipulator
+from pymongoext.cursor import WrappedCursor, LazyDocument
+
+
+class FakePymongoCursor:
+	"""Mimics the buffering of ``pymongo.cursor.Cursor`` for a cursor whose server side is exhausted"""
+
+	def __init__(self, docs, killed=True):
+		self._Cursor__data = deque(docs)
+		self.killed = killed
+		self.retrieved = len(docs)
+
+	@property
+	def alive(self):
+		return bool(len(self._Cursor__data) or not self.killed)
+
+	def next(self):
+		if not self._Cursor__data:
+			raise StopIteration
+		return self._Cursor__data.popleft()
+
+
+class Counter(Model):
+	__auto_update__ = False
+	batches = []
+
+	@classmethod
+	def db(cls):
+		return mongomock.MongoClient()['test']
+
+	class CountingManipulator(Manipulator):
+		def transform_outgoing_batch(self, docs, model):
+			model.batches.append(len(docs))
+			return docs
+
+
+def _docs(n):
+	return [{'_id': i, 'n': i} for i in range(n)]
+
+
+def test_alive_counts_buffered_documents():
+	cursor = WrappedCursor(FakePymongoCursor(_docs(5)), Counter)
+
+	seen = []
+	while cursor.alive:
+		seen.append(cursor.next()['n'])
+
+	assert seen == [0, 1, 2, 3, 4]
+	assert cursor.retrieved == 5
+
+
+def test_batch_is_manipulated_once():
+	Counter.batches = []
+	cursor = WrappedCursor(FakePymongoCursor(_docs(5)), Counter)
+
+	assert [d['n'] for d in cursor.to_list(2)] == [0, 1]
+	assert [d['n'] for d in cursor] == [2, 3, 4]
+	assert Counter.batches == [5]
+
+
+def test_batches_and_lazy_documents():
+	batches = list(WrappedCursor(FakePymongoCursor(_docs(3)), Counter).batches())
+	assert [[d['n'] for d in batch] for batch in batches] == [[0, 1, 2]]
+
+	Counter.batches = []
+	docs = list(WrappedCursor(FakePymongoCursor(_docs(3)), Counter, lazy=True))
+	assert not any(doc.is_manipulated for doc in docs)
+	assert docs[1]['n'] == 1
+	assert docs[1].is_manipulated and not docs[0].is_manipulated
+
+
+def test_copy_lazy_documents():
+	docs = list(WrappedCursor(FakePymongoCursor(_docs(2)), Counter, lazy=True))
+	shallow = copy.copy(docs[0])
+	deep = copy.deepcopy(docs[1])
+	assert shallow == docs[0] and deep == docs[1]
+	assert not isinstance(deep, LazyDocument)
+	assert deep is not docs[1].unwrap()
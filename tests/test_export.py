@@ -0,0 +1,64 @@
+import io
+import json
+from datetime import datetime
+import mongomock
+import numpy
+from pymongoext import Model, DictField, StringField, IntField, DateTimeField
+
+
+class Exported(Model):
+	__auto_update__ = False
+	__schema__ = DictField(dict(
+		rank=IntField(),
+		name=StringField(),
+		age=IntField(),
+		joined=DateTimeField(),
+	))
+	client = mongomock.MongoClient()
+
+	@classmethod
+	def db(cls):
+		return cls.client['test']
+
+
+def _populate():
+	Exported.delete_many({})
+	Exported.insert_many([
+		{'rank': i, 'name': 'n{}'.format(i), 'age': None if i == 3 else i, 'joined': datetime(2020, 1, i + 1)}
+		for i in range(10)
+	])
+
+
+def test_batches_hold_batch_size_documents():
+	_populate()
+	sizes = [len(docs) for docs in Exported.find().batches(4)]
+	assert sizes == [4, 4, 2]
+
+
+def test_export_ndjson_and_csv():
+	_populate()
+	fp = io.StringIO()
+	assert Exported.export(fp, filter={'rank': {'$lt': 2}}, fields=['name', 'age'], sort=[('rank', 1)]) == 2
+	assert [json.loads(line) for line in fp.getvalue().splitlines()] == [
+		{'name': 'n0', 'age': 0}, {'name': 'n1', 'age': 1}
+	]
+
+	fp = io.StringIO(newline='')
+	fields = ['name', 'age', 'joined']
+	assert Exported.export(fp, format='csv', filter={'rank': {'$in': [2, 3]}}, fields=fields, sort=[('rank', 1)]) == 2
+	assert fp.getvalue().splitlines() == [
+		'name,age,joined', 'n2,2,2020-01-03T00:00:00', 'n3,,2020-01-04T00:00:00'
+	]
+
+
+def test_export_columns_and_find_columns():
+	_populate()
+	chunks = list(Exported.export_columns(fields=['age', 'joined'], batch_size=4, sort=[('rank', 1)]))
+	assert [len(chunk['age']) for chunk in chunks] == [4, 4, 2]
+	assert chunks[0]['age'].mask.tolist() == [False, False, False, True]
+
+	columns = Exported.find_columns(fields=['age', 'joined'], batch_size=4, sort=[('rank', 1)])
+	assert columns['age'].dtype == numpy.int64
+	assert columns['age'].sum() == sum(range(10)) - 3
+	assert columns['joined'][0] == numpy.datetime64('2020-01-01T00:00:00', 'ms')
+	assert columns['age'].mask.tolist() == [i == 3 for i in range(10)]
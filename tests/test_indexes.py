@@ -0,0 +1,64 @@
+import mongomock
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongoext.indexes import index_plan
+
+
+def _collection():
+	collection = mongomock.MongoClient()['test']['indexed']
+	collection.insert_one({'email': 'a', 'name': 'b'})
+	return collection
+
+
+def test_plan():
+	collection = _collection()
+	collection.create_index('email', unique=True, name='email_1')
+	collection.create_index('name', name='by_name')
+	collection.create_index('age', name='age_1')
+
+	declared = [
+		IndexModel('email', name='email_1'),
+		IndexModel('name'),
+		IndexModel([('age', DESCENDING)], name='age_1'),
+		IndexModel([('city', ASCENDING), ('zip', ASCENDING)]),
+	]
+	plan = index_plan(declared, collection.index_information())
+
+	assert [m.document['name'] for m in plan.create] == ['city_1_zip_1']
+	assert sorted(m.document['name'] for m in plan.rebuild) == ['age_1', 'email_1']
+	assert plan.drop == []
+	# Renamed indexes are kept
+	assert plan.unchanged == ['by_name']
+	assert not plan.is_empty
+
+
+def test_unchanged_indexes():
+	declared = [IndexModel('email', unique=True), IndexModel([('bio', TEXT)], name='bio_text')]
+	existing = {
+		'_id_': {'key': [('_id', 1)], 'v': 2},
+		'email_1': {'key': [('email', 1)], 'unique': True, 'v': 2},
+		'bio_text': {
+			'key': [('_fts', 'text'), ('_ftsx', 1)], 'weights': {'bio': 1}, 'v': 2,
+			'default_language': 'english', 'language_override': 'language', 'textIndexVersion': 3
+		},
+		'old': {'key': [('old', 1.0)], 'v': 2},
+	}
+	plan = index_plan(declared, existing)
+	assert plan.create == [] and plan.rebuild == []
+	assert plan.drop == ['old']
+	assert sorted(plan.unchanged) == ['bio_text', 'email_1']
+
+
+def test_apply_rebuilds_only_on_request():
+	collection = _collection()
+	collection.create_index('email', name='email_1')
+	collection.create_index('old')
+	declared = [IndexModel('email', unique=True, name='email_1'), IndexModel('name')]
+
+	index_plan(declared, collection.index_information()).apply(collection)
+	info = collection.index_information()
+	assert sorted(info) == ['_id_', 'email_1', 'name_1']
+	assert not info['email_1'].get('unique')
+
+	index_plan(declared, collection.index_information()).apply(collection, rebuild=True)
+	assert collection.index_information()['email_1']['unique']
+	assert index_plan(declared, collection.index_information()).is_empty
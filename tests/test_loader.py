@@ -0,0 +1,92 @@
+import asyncio
+import mongomock
+import pytest
+from pymongoext import Model, AsyncModel
+from pymongoext.exceptions import NoDocumentFound
+from tests.fakes import FakeAsyncDatabase
+
+_client = mongomock.MongoClient()
+_async_db = FakeAsyncDatabase()
+
+
+class Author(Model):
+	__auto_update__ = False
+
+	@classmethod
+	def db(cls):
+		return _client['test']
+
+
+class AsyncAuthor(AsyncModel):
+	__auto_update__ = False
+	__collection_name__ = 'author'
+
+	@classmethod
+	def db(cls):
+		return _async_db
+
+
+def _count_queries(monkeypatch, collection):
+	"""Record the ids of each query sent to a mongomock collection"""
+	queries = []
+	find = type(collection).find
+
+	def recording_find(self, filter=None, *args, **kwargs):
+		queries.append(list(filter['_id']['$in']))
+		return find(self, filter, *args, **kwargs)
+
+	monkeypatch.setattr(type(collection), 'find', recording_find)
+	return queries
+
+
+@pytest.fixture
+def authors():
+	for collection in (_client['test']['author'], _async_db.delegate['author']):
+		collection.delete_many({})
+		collection.insert_many([{'_id': i, 'name': 'a{}'.format(i)} for i in range(10)])
+
+
+def test_loader_batches_lookups(authors, monkeypatch):
+	queries = _count_queries(monkeypatch, _client['test']['author'])
+
+	with Author.loader(max_batch_size=3) as loader:
+		pending = [loader.load(i) for i in (5, 1, 5, 7, 2, 9, 1)]
+		assert not any(p.done for p in pending)
+
+	assert [p.result()['name'] for p in pending] == ['a5', 'a1', 'a5', 'a7', 'a2', 'a9', 'a1']
+	# Duplicates are sent once, in batches of at most max_batch_size ids
+	assert queries == [[5, 1, 7], [2, 9]]
+	assert pending[0].result() is pending[2].result()
+
+
+def test_loader_get_and_misses(authors, monkeypatch):
+	queries = _count_queries(monkeypatch, _client['test']['author'])
+	loader = Author.loader()
+
+	assert loader.get(3).name == 'a3'
+	assert loader.get(3).name == 'a3'
+	assert [doc.name for doc in loader.load_many([4, 3, 0])] == ['a4', 'a3', 'a0']
+	assert queries == [[3], [4, 0]]
+
+	with pytest.raises(NoDocumentFound):
+		loader.get(42)
+	with pytest.raises(NoDocumentFound):
+		loader.load_many([1, 43])
+
+
+def test_async_loader(authors, monkeypatch):
+	queries = _count_queries(monkeypatch, _async_db.delegate['author'])
+
+	async def scenario():
+		loader = AsyncAuthor.loader(max_batch_size=2)
+		docs = await asyncio.gather(*[loader.load(i) for i in (4, 2, 4, 8)])
+		assert [doc.name for doc in docs] == ['a4', 'a2', 'a4', 'a8']
+		assert sorted(map(sorted, queries)) == [[2, 4], [8]]
+
+		assert [doc.name for doc in await loader.load_many([8, 6])] == ['a8', 'a6']
+		assert queries[-1] == [6]
+
+		with pytest.raises(NoDocumentFound):
+			await loader.get(42)
+
+	asyncio.run(scenario())
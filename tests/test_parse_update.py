@@ -0,0 +1,75 @@
+import copy
+import bson
+import mongomock
+import pytest
+from pymongoext import (
+	Model, DictField, MapField, ListField, StringField, IntField, NumberField, ObjectIDField
+)
+
+_OWNER = '5f0000000000000000000000'
+
+
+class Account(Model):
+	__auto_update__ = False
+	__schema__ = DictField(dict(
+		age=IntField(),
+		name=StringField(),
+		address=DictField(dict(zip=IntField(), city=StringField()), additional_props=False),
+		products=ListField(DictField(dict(name=StringField(), price=NumberField()))),
+		tags=ListField(IntField()),
+		meta=MapField(IntField()),
+		owner=ObjectIDField(),
+		extra=DictField(dict(n=IntField())),
+	), additional_props=False)
+	client = mongomock.MongoClient()
+
+	@classmethod
+	def db(cls):
+		return cls.client['test']
+
+
+@pytest.mark.parametrize('update, expected', [
+	({'$set': {'age': '21', 'name': 5}}, {'$set': {'age': 21, 'name': '5'}}),
+	({'$set': {'address.zip': '00100'}}, {'$set': {'address.zip': 100}}),
+	# Keys not allowed by a closed schema are dropped
+	({'$set': {'address.street': 'x', 'unknown': 1, 'age': 1}}, {'$set': {'age': 1}}),
+	# Keys of an open embedded document are left untouched
+	({'$set': {'extra.n': '1', 'extra.other': '1'}}, {'$set': {'extra.n': 1, 'extra.other': '1'}}),
+	({'$set': {'products.0.price': '1.5'}}, {'$set': {'products.0.price': 1.5}}),
+	({'$set': {'products.$.name': 5}}, {'$set': {'products.$.name': '5'}}),
+	({'$set': {'products.$[].price': '2'}}, {'$set': {'products.$[].price': 2.0}}),
+	({'$set': {'products.$[item].name': 1}}, {'$set': {'products.$[item].name': '1'}}),
+	# Whole lists are parsed as on insert, without parsing their items
+	({'$set': {'products': [{'name': 1}]}}, {'$set': {'products': [{'name': 1}]}}),
+	({'$set': {'meta.x': '4'}}, {'$set': {'meta.x': 4}}),
+	({'$setOnInsert': {'owner': _OWNER}}, {'$setOnInsert': {'owner': bson.ObjectId(_OWNER)}}),
+	({'$inc': {'age': '2'}}, {'$inc': {'age': 2}}),
+	({'$push': {'tags': '3'}}, {'$push': {'tags': 3}}),
+	({'$push': {'tags': {'$each': ['1', '2'], '$slice': -5}}}, {'$push': {'tags': {'$each': [1, 2], '$slice': -5}}}),
+	({'$addToSet': {'products': {'name': 1}}}, {'$addToSet': {'products': {'name': '1'}}}),
+	({'$unset': {'age': ''}, '$rename': {'name': 'nom'}}, {'$unset': {'age': ''}, '$rename': {'name': 'nom'}}),
+	({'$set': {'age': '1'}, '$unset': {'name': ''}}, {'$set': {'age': 1}, '$unset': {'name': ''}}),
+])
+def test_parse_update(update, expected):
+	original = copy.deepcopy(update)
+	assert Account.parse_update(update) == expected
+	assert update == original
+
+
+def test_parse_update_leaves_unparsed_updates_as_is():
+	update = {'$unset': {'age': ''}}
+	assert Account.parse_update(update) is update
+
+	pipeline = [{'$set': {'age': 1}}]
+	assert Account.parse_update(pipeline) is pipeline
+
+
+def test_updates_are_parsed_on_write():
+	Account.delete_many({})
+	_id = Account.insert_one({'name': 'a'}).inserted_id
+	update = {'$set': {'age': '3', 'address.zip': '7'}, '$push': {'tags': '1'}}
+	Account.update_one({'_id': _id}, update)
+
+	doc = Account.find_one({'_id': _id})
+	assert doc.age == 3 and doc.address == {'zip': 7} and doc.tags == [1]
+	assert update == {'$set': {'age': '3', 'address.zip': '7'}, '$push': {'tags': '1'}}
@@ -0,0 +1,81 @@
+import copy
+from datetime import datetime, timezone
+import bson
+import pytest
+from pymongoext import (
+	DictField, MapField, ListField, StringField, IntField, DateTimeField, ObjectIDField, OneOf
+)
+
+_SCHEMA = DictField(
+	dict(
+		name=StringField(required=True),
+		tags=ListField(StringField(), default=list),
+		owner=ObjectIDField(),
+		created=DateTimeField(default=lambda: datetime(2020, 1, 1)),
+		address=DictField(dict(
+			city=StringField(default='Nairobi'),
+			zip=IntField()
+		)),
+		scores=MapField(IntField(default=0)),
+		either=OneOf(StringField(), IntField()),
+	),
+	additional_props=False
+)
+
+_DOCUMENTS = [
+	None,
+	{},
+	{'name': 'a', 'extra': 1},
+	{'_id': str(bson.ObjectId()), 'owner': str(bson.ObjectId()), 'created': '2021-02-03T04:05:06Z'},
+	{'address': None, 'scores': {'x': 1, 'y': None}, 'tags': ['a']},
+	{'address': {'zip': 1, 'street': 'x'}, 'created': 0, 'either': 2},
+]
+
+
+@pytest.mark.parametrize('doc', _DOCUMENTS)
+@pytest.mark.parametrize('with_defaults', [False, True])
+@pytest.mark.parametrize('is_schema', [False, True])
+def test_compiled_parser_matches_parse(doc, with_defaults, is_schema):
+	parse = _SCHEMA.compile_parser(is_schema=is_schema)
+	original = copy.deepcopy(doc)
+
+	expected = _SCHEMA.parse(copy.deepcopy(doc), with_defaults, is_schema=is_schema)
+	result = parse(doc, with_defaults)
+
+	assert result == expected
+	assert doc == original
+
+
+def test_compiled_parser_does_not_share_defaults():
+	parse = _SCHEMA.compile_parser()
+	first = parse({}, True)
+	first['tags'].append('x')
+	assert parse({}, True)['tags'] == []
+
+
+def test_datetime_field_arguments():
+	default = datetime(2020, 1, 1)
+	field = DateTimeField(default, True, formats=['%d/%m/%Y'])
+	assert field.default == default and field.required
+	assert field.parse(None, True) == default
+	assert field.parse('03/02/2021', False) == datetime(2021, 2, 3)
+
+
+@pytest.mark.parametrize('value, expected', [
+	('2021-02-03T04:05:06.5', datetime(2021, 2, 3, 4, 5, 6, 500000)),
+	('2021-02-03', datetime(2021, 2, 3)),
+	('2021-02-03T04:05:06Z', datetime(2021, 2, 3, 4, 5, 6, tzinfo=timezone.utc)),
+	('2021-02-03T04:05:06+00:00', datetime(2021, 2, 3, 4, 5, 6, tzinfo=timezone.utc)),
+	('Feb 3 2021', datetime(2021, 2, 3)),
+	(86400, datetime(1970, 1, 2)),
+	(1.5, datetime(1970, 1, 1, 0, 0, 1, 500000)),
+	(datetime(2021, 2, 3), datetime(2021, 2, 3)),
+])
+def test_datetime_field_parse(value, expected):
+	parsed = DateTimeField().parse(value, False)
+	assert parsed == expected and parsed.tzinfo == expected.tzinfo
+
+
+def test_datetime_field_rejects_bool():
+	with pytest.raises(TypeError):
+		DateTimeField().parse(True, False)
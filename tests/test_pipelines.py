@@ -0,0 +1,61 @@
+from pymongoext import Model, Manipulator
+from pymongoext.model import _CLASS_CACHE
+
+
+class Tagged(Model):
+	__auto_update__ = False
+
+	class NameManipulator(Manipulator):
+		fields = ('name',)
+
+		def transform_outgoing(self, doc, model):
+			doc['upper'] = doc['name'].upper()
+			return doc
+
+	class AgeManipulator(Manipulator):
+		fields = ('age',)
+
+		def transform_outgoing(self, doc, model):
+			doc['adult'] = doc['age'] >= 18
+			return doc
+
+
+def test_manipulators_skipped_by_projection():
+	doc = Tagged.apply_outgoing_manipulators({'_id': 1, 'name': 'ann', 'age': 20})
+	assert doc.upper == 'ANN' and doc.adult
+
+	doc = Tagged.apply_outgoing_manipulators({'_id': 1, 'name': 'ann'}, {'name': 1})
+	assert doc.upper == 'ANN' and 'adult' not in doc
+
+	doc = Tagged.apply_outgoing_manipulators({'_id': 1}, ['_id'])
+	assert 'upper' not in doc and 'adult' not in doc
+
+
+def test_pipelines_cached_per_excluded_manipulators():
+	Tagged._invalidate_cache()
+	projections = [None, {'name': 1, 'age': 1}, ['name', 'age', 'other']]
+	projections += [{'name': 1, 'x{}'.format(i): 1} for i in range(50)]
+	projections += [{'age': 1, 'x{}'.format(i): 1} for i in range(50)]
+	projections += [{'age': 0, 'x{}'.format(i): 0} for i in range(50)]
+	for projection in projections:
+		Tagged._pipelines(projection)
+
+	# One pipeline for all fields present and one per excluded manipulator
+	pipelines = [key for key in _CLASS_CACHE[Tagged] if isinstance(key, tuple) and key[0] == 'pipelines']
+	assert len(pipelines) == 3
+
+
+def test_cursor_resolves_pipelines_once(monkeypatch):
+	from pymongoext import model
+	from pymongoext.cursor import WrappedCursor
+	from tests.test_cursor import FakePymongoCursor
+
+	calls = []
+	presence = model._presence
+	monkeypatch.setattr(model, '_presence', lambda *args: calls.append(args) or presence(*args))
+
+	for lazy in (False, True):
+		docs = [{'_id': i, 'name': 'n', 'age': i} for i in range(5)]
+		cursor = WrappedCursor(FakePymongoCursor(docs), Tagged, lazy=lazy, projection={'name': 1})
+		assert [doc['upper'] for doc in cursor] == ['N'] * 5
+	assert len(calls) == 2
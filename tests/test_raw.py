@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+import bson
+import pymongo
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongoext import Model
+from pymongoext.cursor import WrappedCursor
+from pymongoext.raw import LazyBSONDocument
+from tests.test_cursor import FakePymongoCursor
+
+_TZ_AWARE = CodecOptions(tz_aware=True)
+
+
+class Raw(Model):
+	__auto_update__ = False
+	# Collections are configured without connecting
+	client = pymongo.MongoClient(connect=False, serverSelectionTimeoutMS=1)
+
+	@classmethod
+	def db(cls):
+		return cls.client.get_database('test', codec_options=_TZ_AWARE)
+
+
+def test_lazy_document():
+	when = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+	data = bson.encode({'a': 1, 'nested': {'when': when, 'items': [1, 2]}, 'b': 'x'})
+
+	doc = LazyBSONDocument(data, _TZ_AWARE)
+	assert list(doc) == ['a', 'nested', 'b']
+	assert doc['b'] == 'x'
+	assert isinstance(doc['nested'], LazyBSONDocument)
+	assert doc['nested']['when'] == when and doc['nested']['items'] == [1, 2]
+	assert LazyBSONDocument(data)['nested']['when'].tzinfo is None
+
+
+def test_raw_collection_keeps_codec_options():
+	codec_options = Raw._raw_collection().codec_options
+	assert codec_options.document_class is RawBSONDocument
+	assert codec_options.tz_aware
+
+
+def test_lazy_raw_cursor_uses_collection_codec_options():
+	when = datetime(2020, 1, 2, tzinfo=timezone.utc)
+	cursor = FakePymongoCursor([RawBSONDocument(bson.encode({'_id': i, 'when': when})) for i in range(2)])
+	cursor.collection = Raw._raw_collection()
+
+	docs = list(WrappedCursor(cursor, Raw, lazy=True, raw=True))
+	assert [doc['when'] for doc in docs] == [when, when]
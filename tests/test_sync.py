@@ -0,0 +1,79 @@
+import mongomock
+import pymongo
+from pymongoext import Model
+from pymongoext.sync import sync_models
+
+_calls = []
+_first = mongomock.MongoClient()
+_second = mongomock.MongoClient()
+
+
+class Recorded(Model):
+	__auto_update__ = False
+
+	@classmethod
+	def _update(cls, collection_info=None, rebuild=None):
+		_calls.append((cls, collection_info))
+		cls._on_update()
+
+
+class First(Recorded):
+	__collection_name__ = 'shared'
+
+	@classmethod
+	def db(cls):
+		return _first['app']
+
+
+class FirstAlias(First):
+	pass
+
+
+class Second(Recorded):
+	__collection_name__ = 'shared'
+
+	@classmethod
+	def db(cls):
+		return _second['app']
+
+
+def _list_collections(db, filter=None):
+	# Not implemented by mongomock
+	names = filter['name']['$in']
+	return [{'name': name, 'options': {}} for name in db.list_collection_names() if name in names]
+
+
+def test_sync_models_per_client(monkeypatch):
+	monkeypatch.setattr(mongomock.database.Database, 'list_collections', _list_collections, raising=False)
+	_first['app']['shared'].insert_one({})
+	timings = sync_models([First, FirstAlias, Second])
+
+	assert [timing.model for timing in timings] == [First, FirstAlias, Second]
+	assert all(timing.error is None for timing in timings)
+
+	# The collection of each client is synced once, with the collection info listed from that client
+	calls = dict(_calls)
+	assert len(_calls) == 2 and set(calls) == {First, Second}
+	assert calls[First]['name'] == 'shared'
+	assert calls[Second] is False
+
+
+def _pymongo_model(host):
+	client = pymongo.MongoClient(host, connect=False)
+
+	class Remote(Model):
+		__collection_name__ = 'shared'
+
+		@classmethod
+		def db(cls):
+			return client['app']
+
+	return Remote
+
+
+def test_sync_key_follows_client_seeds():
+	first = _pymongo_model('mongodb://a:1,b:2/?replicaSet=rs')._sync_key()
+	# A new client of the same servers, as after connection.reset() in a forked worker
+	assert _pymongo_model('mongodb://b:2,a:1/?replicaSet=rs')._sync_key() == first
+	assert _pymongo_model('mongodb://a:1/?replicaSet=rs')._sync_key() != first
+	assert First._sync_key() != Second._sync_key()
@@ -0,0 +1,102 @@
+import mongomock
+import pytest
+from pymongoext import Model, DictField, StringField, IntField
+from pymongoext import model as model_module
+from pymongoext.model import _canonical_schema
+
+_client = mongomock.MongoClient()
+
+
+class RecordingDatabase:
+	"""Wraps a mongomock database, recording the commands and the collections created by ``_update``"""
+
+	def __init__(self, collections):
+		self.delegate = _client['test']
+		self.name = self.delegate.name
+		self.client = _client
+		self.collections = collections
+		self.commands = []
+		self.created = []
+
+	def __getitem__(self, name):
+		return self.delegate[name]
+
+	def list_collections(self, filter=None):
+		return [c for c in self.collections if c['name'] == filter['name']]
+
+	def command(self, command):
+		self.commands.append(command)
+		return {'ok': 1}
+
+
+class Validated(Model):
+	__auto_update__ = False
+	__schema__ = DictField(dict(
+		name=StringField(required=True, enum=['a', 'b', 'c']),
+		age=IntField(required=True),
+	))
+	recording = None
+
+	@classmethod
+	def db(cls):
+		return _client['test']
+
+	@classmethod
+	def _pymongo_db(cls):
+		return cls.recording
+
+
+@pytest.fixture
+def record(monkeypatch):
+	def record(*collections):
+		db = RecordingDatabase(collections)
+		monkeypatch.setattr(Validated, 'recording', db)
+		monkeypatch.setattr(
+			model_module, 'Collection', lambda db, name, **kwargs: db.created.append((name, kwargs)) or db[name]
+		)
+		return db
+	return record
+
+
+def _reordered(schema):
+	"""Returns a copy of a JsonSchema document with its keys, ``required`` and ``enum`` lists in reverse order"""
+	if not isinstance(schema, dict):
+		return schema
+	reordered = {}
+	for key in reversed(list(schema)):
+		value = _reordered(schema[key])
+		if key in ('required', 'enum'):
+			value = value[::-1]
+		reordered[key] = value
+	return reordered
+
+
+def test_canonical_schema():
+	schema = {'required': ['b', 'a'], 'properties': {'x': {'enum': [2, 'y', 1]}}, 'anyOf': [{'a': 1}, {'b': 2}]}
+	assert _canonical_schema(schema) == _canonical_schema({
+		'properties': {'x': {'enum': [1, 2, 'y']}}, 'anyOf': [{'a': 1}, {'b': 2}], 'required': ['a', 'b']
+	})
+	# Other lists keep their order
+	assert _canonical_schema(schema) != _canonical_schema(dict(schema, anyOf=[{'b': 2}, {'a': 1}]))
+	assert _canonical_schema(schema) != _canonical_schema(dict(schema, required=['a']))
+
+
+def test_update_skips_matching_validator(record):
+	validator = Validated._validator()
+	db = record({'name': 'validated', 'options': {'validator': _reordered(validator)}})
+	Validated._update()
+	assert db.commands == [] and db.created == []
+
+
+def test_update_changed_validator(record):
+	db = record({'name': 'validated', 'options': {'validator': {'$jsonSchema': {'required': ['name']}}}})
+	Validated._update()
+	assert db.commands == [{'collMod': 'validated', 'validator': Validated._validator()}]
+	assert db.created == []
+
+
+def test_update_creates_missing_collection(record):
+	db = record({'name': 'other'})
+	Validated._update()
+	assert db.commands == []
+	assert db.created == [('validated', {'validator': Validated._validator()})]